@@ -0,0 +1,181 @@
+"""Headless batch mode: create many shortcuts from a manifest without starting Qt.
+
+    python main.py batch manifest.toml [--desktop DIR] [--report report.json]
+
+A manifest lists one entry per shortcut with the same fields as the window:
+`script` (required), `icon`, `name` and `hide_console`.
+
+    TOML:  [[shortcut]] tables
+    JSON:  a list of objects, or {"shortcuts": [...]}
+    CSV:   a header row naming the columns
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+from icon_cache import IconCache
+from icon_pipeline import default_workers, warm_cache
+from interpreters import InterpreterResolver
+from shortcuts import BACKENDS, DEFAULT_BACKEND, ShortcutError, create_shortcut, get_backend
+
+TRUE_VALUES = {"1", "true", "yes", "y", "on"}
+
+
+class ManifestError(Exception):
+    """Raised when a manifest cannot be read or has no usable entries."""
+
+
+def _as_bool(value):
+    if isinstance(value, bool):
+        return value
+    return str(value or "").strip().lower() in TRUE_VALUES
+
+
+def _normalize(entry, base_dir):
+    if not isinstance(entry, dict):
+        raise ManifestError(f"Manifest entries must be tables/objects, got {type(entry).__name__}.")
+
+    script = str(entry.get("script") or "").strip()
+    icon = str(entry.get("icon") or entry.get("image") or "").strip()
+    # Relative paths are resolved against the manifest, not the current directory.
+    if script and not os.path.isabs(script):
+        script = os.path.normpath(os.path.join(base_dir, script))
+    if icon and not os.path.isabs(icon):
+        icon = os.path.normpath(os.path.join(base_dir, icon))
+
+    return {
+        "script": script,
+        "icon": icon,
+        "name": str(entry.get("name") or "").strip(),
+        "hide_console": _as_bool(entry.get("hide_console", False)),
+    }
+
+
+def load_manifest(path):
+    ext = os.path.splitext(path)[1].lower()
+    try:
+        if ext == ".toml":
+            import tomllib
+            with open(path, "rb") as f:
+                data = tomllib.load(f)
+            entries = data.get("shortcut", data.get("shortcuts", []))
+        elif ext == ".json":
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            entries = data.get("shortcuts", []) if isinstance(data, dict) else data
+        elif ext == ".csv":
+            with open(path, newline="", encoding="utf-8-sig") as f:
+                entries = list(csv.DictReader(f))
+        else:
+            raise ManifestError(f"Unsupported manifest type '{ext}'. Use .toml, .json or .csv.")
+    except OSError as e:
+        raise ManifestError(f"Could not read manifest: {e}") from e
+    except ValueError as e:
+        raise ManifestError(f"Could not parse manifest: {e}") from e
+
+    if not isinstance(entries, list):
+        raise ManifestError("Manifest must contain a list of shortcuts.")
+
+    base_dir = os.path.dirname(os.path.abspath(path))
+    return [_normalize(entry, base_dir) for entry in entries]
+
+
+def run_batch(entries, desktop=None, on_result=None, backend=None, icon_cache=None,
+              workers=1, convert_timeout=None):
+    backend = backend or get_backend()
+    icon_cache = icon_cache or IconCache()
+    resolver = InterpreterResolver()
+    # Convert every distinct image up front in parallel; the loop below then only hits the cache.
+    failed_icons = {}
+    if workers > 1 and backend.uses_icon_cache:
+        failed_icons = warm_cache(icon_cache, (entry["icon"] for entry in entries), backend.icon_sizes,
+                                  workers, convert_timeout)
+
+    results = []
+    # `on_result` may raise to stop early; what was written so far is still finished and saved.
+    try:
+        for index, entry in enumerate(entries):
+            started = time.perf_counter()
+            item = {"index": index, "script": entry["script"], "name": entry["name"]}
+            icon_error = failed_icons.get(entry["icon"])
+            try:
+                result = create_shortcut(entry["script"], "" if icon_error else entry["icon"], entry["name"],
+                                         entry["hide_console"], desktop, backend, icon_cache, resolver=resolver)
+                if icon_error:
+                    result.warnings.insert(0, f"Could not convert image: {icon_error}. Using Python's default icon.")
+                item.update(status="ok", name=result.name, shortcut=result.shortcut_path,
+                            icon=result.icon_location, warnings=result.warnings)
+                if result.warnings:
+                    item["status"] = "warning"
+            except ShortcutError as e:
+                item.update(status="error", error=str(e))
+            item["seconds"] = round(time.perf_counter() - started, 6)
+            results.append(item)
+            if on_result:
+                on_result(item)
+    finally:
+        backend.finish()
+        icon_cache.save()
+        resolver.save()
+    return results
+
+
+def summarize(results):
+    summary = {"total": len(results), "ok": 0, "warning": 0, "error": 0}
+    for item in results:
+        summary[item["status"]] += 1
+    return summary
+
+
+def _print_result(item):
+    label = item["name"] or os.path.basename(item["script"])
+    if item["status"] == "error":
+        print(f"[{item['index'] + 1}] ERROR   {label}: {item['error']}")
+        return
+    print(f"[{item['index'] + 1}] {item['status'].upper():<7} {label} -> {item['shortcut']}")
+    for warning in item.get("warnings", []):
+        print(f"      warning: {warning}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="main.py batch", description="Create shortcuts from a manifest.")
+    parser.add_argument("manifest", help="Path to a .toml, .json or .csv manifest")
+    parser.add_argument("--desktop", help="Folder to write shortcuts to "
+                                          "(default: your Desktop, or ~/.local/share/applications for .desktop files)")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default=DEFAULT_BACKEND,
+                        help="Launcher format and writer (default: %(default)s)")
+    parser.add_argument("--icon-cache", help="Icon cache folder (default: per-user cache)")
+    parser.add_argument("--workers", type=int, default=default_workers(),
+                        help="Processes used to convert icons; 1 converts serially (default: %(default)s)")
+    parser.add_argument("--convert-timeout", type=float,
+                        help="Give up on converting a single image after this many seconds")
+    parser.add_argument("--report", help="Write a JSON report of every item to this path")
+    parser.add_argument("--quiet", action="store_true", help="Only print the summary")
+    args = parser.parse_args(argv)
+
+    try:
+        entries = load_manifest(args.manifest)
+    except ManifestError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    results = run_batch(entries, args.desktop, None if args.quiet else _print_result,
+                        get_backend(args.backend), IconCache(args.icon_cache),
+                        args.workers, args.convert_timeout)
+    summary = summarize(results)
+    print(f"Done: {summary['ok']} ok, {summary['warning']} with warnings, "
+          f"{summary['error']} failed ({summary['total']} total).")
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump({"manifest": os.path.abspath(args.manifest), "summary": summary,
+                       "results": results}, f, indent=2)
+
+    return 1 if summary["error"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,336 @@
+"""Benchmark each stage of the shortcut pipeline separately.
+
+    python benchmarks/pipeline.py [--quick] [--stages decode,encode,...]
+                                  [--save-baseline base.json] [--compare base.json]
+
+Stages:
+    decode      imaging.open_scaled on synthetic JPEG/PNG sources, 16 px to 16k px,
+                at the size ico.build decodes at
+    encode      multi-size ICO build (ico.from_image) from the decoded base image
+    resolve     interpreter resolution for 1 to 1000 scripts (cold and warm cache)
+    serialize   .lnk and .desktop serialization for 1 to 1000 shortcuts
+    write       writing those shortcuts to disk
+
+Each case runs in a fresh process, so its peak RSS is its own. Reports throughput,
+p50/p95 latency and peak memory. --compare exits non-zero if any case's p50 got
+slower than --tolerance (and by at least --min-delta-ms). Runs headless on Linux; no Qt involved.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+IMAGE_SIZES = [16, 256, 1024, 4096, 16384]
+PNG_MAX_SIZE = 4096
+SHORTCUT_COUNTS = [1, 10, 100, 1000]
+QUICK_IMAGE_SIZES = [16, 256, 1024]
+QUICK_SHORTCUT_COUNTS = [1, 100]
+STAGES = ["decode", "encode", "resolve", "serialize", "write"]
+
+
+def reset_peak_rss():
+    # A spawned child starts with its parent's peak: Linux keeps ru_maxrss across exec.
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def peak_rss_mb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def summarize(samples):
+    total = sum(samples)
+    return {
+        "samples": len(samples),
+        "p50_ms": percentile(samples, 0.50) * 1000,
+        "p95_ms": percentile(samples, 0.95) * 1000,
+        "throughput_per_s": len(samples) / total if total else float("inf"),
+    }
+
+
+# --- Synthetic inputs ---
+
+def synthetic_image(workdir, size, fmt):
+    """A noisy 16:9 image `size` px wide; cached in `workdir` across cases."""
+    from PIL import Image
+    path = os.path.join(workdir, f"source_{size}.{fmt}")
+    if not os.path.exists(path):
+        width, height = size, max(1, size * 9 // 16)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", Image.DecompressionBombWarning)
+            small = Image.effect_noise((min(width, 512), min(height, 288)), 64).convert("RGB")
+            small.resize((width, height), Image.Resampling.BILINEAR).save(path)
+    return path
+
+
+def synthetic_scripts(workdir, count):
+    """`count` scripts spread over project folders, half of them with a .venv."""
+    root = os.path.join(workdir, f"scripts_{count}")
+    if not os.path.exists(root):
+        for i in range(count):
+            project = os.path.join(root, f"project{i // 10}")
+            if i % 10 == 0 and (i // 10) % 2 == 0:
+                env_bin = os.path.join(project, ".venv", "bin")
+                os.makedirs(env_bin, exist_ok=True)
+                open(os.path.join(project, ".venv", "pyvenv.cfg"), "w").close()
+                open(os.path.join(env_bin, "python3"), "w").close()
+            folder = os.path.join(project, "tools")
+            os.makedirs(folder, exist_ok=True)
+            with open(os.path.join(folder, f"tool{i}.py"), "w") as f:
+                f.write("#!/usr/bin/env python3\nprint('hi')\n")
+    return sorted(os.path.join(dirpath, name) for dirpath, _, names in os.walk(root)
+                  for name in names if name.endswith(".py"))
+
+
+def synthetic_specs(count):
+    from interpreters import Interpreter
+    from shortcuts import ShortcutSpec
+    interpreter = Interpreter(r"C:\Python311\pythonw.exe")
+    return [ShortcutSpec(f"Tool {i}", rf"C:\tools\project{i // 10}\tool{i}.py", interpreter,
+                         icon=rf"C:\Users\me\AppData\Local\TaskbarPinner\icons\{i:064x}.ico")
+            for i in range(count)]
+
+
+# --- Stages ---
+
+def repeats_for(size):
+    return 3 if size >= 4096 else 10 if size >= 1024 else 30
+
+
+def bench_decode(workdir, size, fmt):
+    import ico
+    from imaging import open_scaled
+    path = synthetic_image(workdir, size, fmt)
+    target = ico.decode_target(ico.DEFAULT_SIZES)
+    samples = []
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for _ in range(repeats_for(size)):
+            started = time.perf_counter()
+            open_scaled(path, target).load()
+            samples.append(time.perf_counter() - started)
+    return summarize(samples)
+
+
+def bench_encode(workdir, size, fmt):
+    import ico
+    from imaging import open_scaled
+    path = synthetic_image(workdir, size, fmt)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        # The same decode size ico.build uses, so this times the real encode step.
+        base = open_scaled(path, ico.decode_target(ico.DEFAULT_SIZES))
+        base.load()
+    samples = []
+    for _ in range(repeats_for(size)):
+        started = time.perf_counter()
+        ico.from_image(base, ico.DEFAULT_SIZES)
+        samples.append(time.perf_counter() - started)
+    return summarize(samples)
+
+
+def bench_resolve(workdir, count):
+    from interpreters import InterpreterResolver
+    scripts = synthetic_scripts(workdir, count)
+    cache_path = os.path.join(workdir, f"interpreters_{count}.json")
+    if os.path.exists(cache_path):
+        os.remove(cache_path)
+
+    results = {}
+    for label in ("cold", "warm"):
+        resolver = InterpreterResolver(cache_path)
+        samples = []
+        for script in scripts:
+            started = time.perf_counter()
+            resolver.resolve(script, hide_console=True)
+            samples.append(time.perf_counter() - started)
+        resolver.save()
+        results[label] = summarize(samples)
+    return results
+
+
+def bench_serialize(workdir, count):
+    from shortcuts import DesktopEntryBackend, link_for
+    import desktop_entry
+    import lnk
+    specs = synthetic_specs(count)
+    backend = DesktopEntryBackend(theme_dir=workdir)
+    results = {}
+    for label, serialize in (("lnk", lambda spec: lnk.serialize(link_for(spec))),
+                             ("desktop", lambda spec: desktop_entry.serialize(backend.entry_for(spec)))):
+        samples = []
+        for spec in specs:
+            started = time.perf_counter()
+            serialize(spec)
+            samples.append(time.perf_counter() - started)
+        results[label] = summarize(samples)
+    return results
+
+
+def bench_write(workdir, count):
+    from shortcuts import link_for
+    import lnk
+    specs = synthetic_specs(count)
+    payloads = [lnk.serialize(link_for(spec)) for spec in specs]
+    out = tempfile.mkdtemp(dir=workdir)
+    samples = []
+    for i, data in enumerate(payloads):
+        path = os.path.join(out, f"shortcut{i}.lnk")
+        started = time.perf_counter()
+        with open(path, "wb") as f:
+            f.write(data)
+        samples.append(time.perf_counter() - started)
+    return summarize(samples)
+
+
+BENCHES = {"decode": bench_decode, "encode": bench_encode, "resolve": bench_resolve,
+           "serialize": bench_serialize, "write": bench_write}
+
+
+def _run_case(stage, args, queue):
+    try:
+        reset_peak_rss()
+        before = peak_rss_mb()
+        result = BENCHES[stage](*args)
+        queue.put({"result": result, "peak_rss_mb": peak_rss_mb(), "start_rss_mb": before})
+    except Exception as e:
+        queue.put({"error": f"{type(e).__name__}: {e}"})
+
+
+def run_case(stage, args):
+    """Run one case in a fresh process so its peak RSS isn't inflated by earlier cases."""
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_run_case, args=(stage, args, queue))
+    proc.start()
+    outcome = queue.get()
+    proc.join()
+    return outcome
+
+
+def cases(stages, image_sizes, counts, workdir):
+    for stage in stages:
+        if stage in ("decode", "encode"):
+            for size in image_sizes:
+                for fmt in ("jpg", "png"):
+                    if fmt == "png" and size > PNG_MAX_SIZE:
+                        continue
+                    # Built here, in the parent, so generating it doesn't count towards the case's peak RSS.
+                    synthetic_image(workdir, size, fmt)
+                    yield stage, f"{size}px {fmt}", (workdir, size, fmt)
+        else:
+            for count in counts:
+                if stage == "resolve":
+                    synthetic_scripts(workdir, count)
+                yield stage, f"{count} shortcuts", (workdir, count)
+
+
+def flatten(stage, case, outcome):
+    """One row per measured series (some stages measure several variants)."""
+    result = outcome["result"]
+    series = result if "p50_ms" not in result else {"": result}
+    for variant, stats in series.items():
+        name = f"{case} {variant}".strip()
+        yield {"stage": stage, "case": name, **stats,
+               "peak_rss_mb": outcome["peak_rss_mb"], "start_rss_mb": outcome["start_rss_mb"]}
+
+
+def print_row(row):
+    rss = f"{row['peak_rss_mb']:8.1f}" if row.get("peak_rss_mb") is not None else "       -"
+    print(f"{row['stage']:<10} {row['case']:<26} {row['throughput_per_s']:12.1f} "
+          f"{row['p50_ms']:10.3f} {row['p95_ms']:10.3f} {rss}")
+
+
+def compare(rows, baseline, tolerance, min_delta_ms):
+    previous = {(r["stage"], r["case"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for row in rows:
+        old = previous.get((row["stage"], row["case"]))
+        # Sub-millisecond cases jitter by more than any sane tolerance; ignore tiny absolute changes.
+        if old and row["p50_ms"] > old["p50_ms"] * (1 + tolerance) and row["p50_ms"] - old["p50_ms"] >= min_delta_ms:
+            regressions.append((row, old))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="Small inputs only, for a fast smoke run")
+    parser.add_argument("--stages", default=",".join(STAGES), help="Comma-separated subset of: " + ", ".join(STAGES))
+    parser.add_argument("--workdir", help="Where synthetic inputs are kept (default: a temp folder)")
+    parser.add_argument("--save-baseline", metavar="PATH", help="Write results as JSON")
+    parser.add_argument("--compare", metavar="PATH", help="Compare p50 latencies with a saved baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed p50 slowdown before --compare fails (default: %(default)s)")
+    parser.add_argument("--min-delta-ms", type=float, default=0.5,
+                        help="Ignore p50 slowdowns smaller than this many ms (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    unknown = [s for s in stages if s not in BENCHES]
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)}")
+    image_sizes = QUICK_IMAGE_SIZES if args.quick else IMAGE_SIZES
+    counts = QUICK_SHORTCUT_COUNTS if args.quick else SHORTCUT_COUNTS
+    workdir = args.workdir or tempfile.mkdtemp(prefix="pinner-bench-")
+    os.makedirs(workdir, exist_ok=True)
+
+    print(f"{'stage':<10} {'case':<26} {'items/s':>12} {'p50 ms':>10} {'p95 ms':>10} {'peak MB':>8}")
+    rows = []
+    failed = False
+    for stage, case, case_args in cases(stages, image_sizes, counts, workdir):
+        outcome = run_case(stage, case_args)
+        if "error" in outcome:
+            print(f"{stage:<10} {case:<26} failed: {outcome['error']}")
+            failed = True
+            continue
+        for row in flatten(stage, case, outcome):
+            rows.append(row)
+            print_row(row)
+
+    report = {"python": platform.python_version(), "platform": platform.platform(),
+              "timestamp": time.time(), "results": rows}
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(rows, json.load(f), args.tolerance, args.min_delta_ms)
+        for row, old in regressions:
+            print(f"REGRESSION {row['stage']} {row['case']}: p50 {old['p50_ms']:.3f} -> {row['p50_ms']:.3f} ms")
+        if regressions:
+            return 1
+        print("No regressions against baseline.")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""Time App.update_status, the call made for every progress message.
+
+    python benchmarks/status_update.py [--updates N] [--path before|after|both]
+
+Runs offscreen, so it works headless. "after" is update_status as it is now, a
+property flip on the status bar. "before" replays what it did before themes were
+precompiled: a full window setStyleSheet for each plain message, and an extra
+color rule on the status bar's own sheet for each error. Both run in the same
+process on the same window, so the two figures are directly comparable.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication
+
+
+def update_status_before(window, message, is_error=False):
+    window.status_bar.setText(message)
+    if is_error:
+        base_style = window.status_bar.styleSheet()
+        window.status_bar.setStyleSheet(f"{base_style} color: {window.theme.colors['error']};")
+    else:
+        window.setStyleSheet(window.theme.stylesheet)
+        window.status_bar.setText(message)
+
+
+def time_updates(app, update, count, error_every):
+    started = time.perf_counter()
+    for i in range(count):
+        update(f"Status {i}", is_error=bool(error_every) and i % error_every == 0)
+        app.processEvents()
+    return (time.perf_counter() - started) / count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--updates", type=int, default=200)
+    parser.add_argument("--path", choices=("before", "after", "both"), default="both")
+    args = parser.parse_args(argv)
+
+    app = QApplication(sys.argv[:1])
+    from main import App
+    window = App()
+    window.show()
+    app.processEvents()
+
+    paths = {"after": window.update_status,
+             "before": lambda message, is_error=False: update_status_before(window, message, is_error)}
+    chosen = ["after", "before"] if args.path == "both" else [args.path]
+    results = {}
+    for label, error_every in (("plain", 0), ("alternating error", 2)):
+        for path in chosen:
+            results[label, path] = time_updates(app, paths[path], args.updates, error_every)
+            # Undo the old path's per-widget sheet so each run starts from the same state.
+            window.status_bar.setStyleSheet("")
+            window.update_status("")
+            app.processEvents()
+
+    print(f"{'':<18} " + " ".join(f"{path:>10}" for path in chosen) + ("    speedup" if len(chosen) == 2 else ""))
+    for label in ("plain", "alternating error"):
+        row = [results[label, path] for path in chosen]
+        line = f"{label:<18} " + " ".join(f"{seconds * 1e6:7.0f} us" for seconds in row)
+        if len(row) == 2:
+            line += f"  {row[1] / row[0]:8.1f}x"
+        print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
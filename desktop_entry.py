@@ -0,0 +1,133 @@
+"""Freedesktop launcher (.desktop) writer and hicolor icon installer.
+
+The Linux counterpart of lnk.py. Launchers follow the Desktop Entry
+Specification. Icons are installed as PNGs into each hicolor size folder under
+a content-addressed name, so launchers that share an image share its icons.
+Menu and icon-cache databases are refreshed once per run by `refresh`, not once
+per launcher.
+"""
+import io
+import os
+import shutil
+import subprocess
+from dataclasses import dataclass
+
+HICOLOR_SIZES = [16, 24, 32, 48, 64, 128, 256]
+ICON_PREFIX = "taskbar-pinner-"
+# Characters that force an Exec argument to be quoted (Desktop Entry spec, "Exec key").
+RESERVED = set(" \t\n\"'\\><~|&;$*?#()`")
+
+
+@dataclass
+class DesktopEntry:
+    """The fields of a Type=Application launcher this app writes."""
+    name: str
+    argv: list
+    path: str = ""
+    icon: str = ""
+    terminal: bool = False
+    comment: str = ""
+
+
+def data_home():
+    return os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share")
+
+
+def applications_dir():
+    return os.path.join(data_home(), "applications")
+
+
+def icon_theme_dir():
+    return os.path.join(data_home(), "icons", "hicolor")
+
+
+def icon_name(key):
+    return f"{ICON_PREFIX}{key[:20]}"
+
+
+def _escape_value(value):
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace("\t", "\\t").replace("\r", "\\r")
+
+
+def quote_arg(arg):
+    arg = arg.replace("%", "%%")
+    if not arg or any(c in RESERVED for c in arg):
+        arg = '"' + "".join("\\" + c if c in '"`$\\' else c for c in arg) + '"'
+    return arg
+
+
+def exec_line(argv):
+    return " ".join(quote_arg(arg) for arg in argv)
+
+
+def serialize(entry):
+    lines = ["[Desktop Entry]", "Type=Application", "Version=1.5",
+             f"Name={_escape_value(entry.name)}",
+             f"Exec={_escape_value(exec_line(entry.argv))}"]
+    if entry.path:
+        lines.append(f"Path={_escape_value(entry.path)}")
+    if entry.icon:
+        lines.append(f"Icon={_escape_value(entry.icon)}")
+    if entry.comment:
+        lines.append(f"Comment={_escape_value(entry.comment)}")
+    lines.append(f"Terminal={'true' if entry.terminal else 'false'}")
+    return "\n".join(lines) + "\n"
+
+
+def parse(text):
+    """Return the raw key/value pairs of the [Desktop Entry] group."""
+    values = {}
+    in_group = False
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith("["):
+            in_group = line == "[Desktop Entry]"
+        elif in_group and "=" in line and not line.startswith("#"):
+            key, value = line.split("=", 1)
+            values[key.strip()] = value.strip()
+    return values
+
+
+def write(entry, path):
+    data = serialize(entry).encode("utf-8")
+    with open(path, "wb") as f:
+        f.write(data)
+    # Desktop environments only launch .desktop files on the desktop when they are executable.
+    os.chmod(path, 0o755)
+    return len(data)
+
+
+def icon_installed(name, theme_dir=None):
+    theme_dir = theme_dir or icon_theme_dir()
+    return all(os.path.exists(os.path.join(theme_dir, f"{s}x{s}", "apps", f"{name}.png")) for s in HICOLOR_SIZES)
+
+
+def install_icon(data, name, theme_dir=None, sizes=HICOLOR_SIZES):
+    """Render image bytes into `<theme_dir>/<N>x<N>/apps/<name>.png` for every size."""
+    from PIL import UnidentifiedImageError
+    from ico import render_frames
+    from imaging import open_scaled
+    theme_dir = theme_dir or icon_theme_dir()
+    try:
+        base = open_scaled(io.BytesIO(data), max(sizes))
+    except UnidentifiedImageError:
+        raise ValueError("unrecognised image format") from None
+
+    # Same stepwise-downscaled, sharpened frames as the .ico builder, padded square
+    # because each NxN folder of the theme must hold an NxN image.
+    for size, frame in render_frames(base, sizes, pad=True).items():
+        folder = os.path.join(theme_dir, f"{size}x{size}", "apps")
+        os.makedirs(folder, exist_ok=True)
+        frame.save(os.path.join(folder, f"{name}.png"), format="PNG")
+
+
+def refresh(entries_dir=None, theme_dir=None, icons=True, entries=True):
+    """Rebuild the menu and icon caches once; missing tools are skipped silently."""
+    commands = []
+    if entries and shutil.which("update-desktop-database"):
+        commands.append(["update-desktop-database", entries_dir or applications_dir()])
+    if icons and shutil.which("gtk-update-icon-cache"):
+        commands.append(["gtk-update-icon-cache", "-f", "-t", "-q", theme_dir or icon_theme_dir()])
+    for command in commands:
+        subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+    return len(commands)
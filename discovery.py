@@ -0,0 +1,165 @@
+"""Find runnable scripts under dropped files and folders.
+
+    python main.py discover DIR... [--include GLOB] [--exclude GLOB] [--all] > manifest.csv
+
+Folders are walked with os.scandir, one directory at a time, so a large monorepo
+never has its whole file list in memory; candidates are yielded as they are found.
+A .py file counts as an entry point if it is a .pyw, starts with a shebang, has an
+`if __name__ == "__main__":` guard, or is a package's __main__.py. Files dropped
+individually are always taken as they are.
+"""
+import argparse
+import csv
+import fnmatch
+import os
+import re
+import sys
+from dataclasses import dataclass
+
+DEFAULT_INCLUDE = ["*.py", "*.pyw"]
+# Matched against folder names; none of these hold scripts anyone wants pinned.
+DEFAULT_EXCLUDE = [".*", "__pycache__", "venv", "env", "site-packages", "node_modules",
+                   "build", "dist", "test", "tests"]
+MAIN_GUARD = re.compile(rb"""^if\s+__name__\s*==\s*['"]__main__['"]\s*:""", re.MULTILINE)
+# Guards are usually at the bottom, but generated or vendored giants aren't worth reading.
+MAX_READ_BYTES = 1024 * 1024
+
+
+@dataclass
+class Candidate:
+    """A script found by `scan`. `reason` says why it looks runnable."""
+    path: str
+    reason: str
+    name: str = ""
+
+
+def _matcher(patterns):
+    """One compiled regex for all `patterns`, tried against a name and a relative path."""
+    if not patterns:
+        return lambda name, relpath: False
+    regex = re.compile("|".join(fnmatch.translate(os.path.normcase(p)) for p in patterns))
+    return lambda name, relpath: bool(regex.match(os.path.normcase(name)) or regex.match(os.path.normcase(relpath)))
+
+
+def entry_point_reason(path):
+    """Why `path` looks like something to launch, or "" if it looks like a module."""
+    name = os.path.basename(path)
+    if name.lower().endswith(".pyw"):
+        return "windowed script"
+    if name == "__main__.py":
+        return "package __main__"
+    try:
+        with open(path, "rb") as f:
+            head = f.read(MAX_READ_BYTES)
+    except OSError:
+        return ""
+    if head.startswith(b"#!"):
+        return "shebang"
+    if b"__main__" in head and MAIN_GUARD.search(head):
+        return "__main__ guard"
+    return ""
+
+
+def display_name(path):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    # `python pkg/__main__.py` is the package's entry point; name it after the package.
+    return os.path.basename(os.path.dirname(os.path.abspath(path))) if stem == "__main__" else stem
+
+
+def _walk(root, included, excluded, entry_points_only, cancelled):
+    prefix = len(os.path.join(root, ""))
+    pending = [root]
+    while pending:
+        if cancelled and cancelled():
+            return
+        directory = pending.pop()
+        subdirs = []
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    relpath = entry.path[prefix:].replace(os.sep, "/")
+                    if excluded(entry.name, relpath):
+                        continue
+                    try:
+                        # Symlinked folders are skipped; they are how trees loop.
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                            continue
+                        if not entry.is_file():
+                            continue
+                    except OSError:
+                        continue
+                    if not included(entry.name, relpath):
+                        continue
+                    reason = entry_point_reason(entry.path)
+                    if reason or not entry_points_only:
+                        yield Candidate(entry.path, reason, display_name(entry.path))
+        except OSError:
+            continue
+        # Reversed so that popping visits sibling folders in name order.
+        pending.extend(sorted(subdirs, reverse=True))
+
+
+def scan(paths, include=DEFAULT_INCLUDE, exclude=DEFAULT_EXCLUDE, entry_points_only=True, cancelled=None):
+    """Yield a Candidate per script in `paths`, streaming folders as they are walked.
+
+    `cancelled()` is polled between folders; return True from it to stop early.
+    """
+    included, excluded = _matcher(include), _matcher(exclude)
+    seen = set()
+    for path in paths:
+        path = os.path.abspath(path)
+        if os.path.isdir(path):
+            found = _walk(path, included, excluded, entry_points_only, cancelled)
+        elif os.path.isfile(path):
+            found = [Candidate(path, "dropped", display_name(path))]
+        else:
+            continue
+        for candidate in found:
+            key = os.path.normcase(candidate.path)
+            if key not in seen:
+                seen.add(key)
+                yield candidate
+
+
+def unique_names(candidates):
+    """Shortcut names for `candidates`, adding the parent folder where names clash."""
+    counts = {}
+    for candidate in candidates:
+        counts[candidate.name.lower()] = counts.get(candidate.name.lower(), 0) + 1
+    names = []
+    for candidate in candidates:
+        name = candidate.name
+        if counts[name.lower()] > 1:
+            parent = os.path.basename(os.path.dirname(os.path.abspath(candidate.path)))
+            name = f"{name} ({parent})"
+        names.append(name)
+    return names
+
+
+def split_patterns(text):
+    return [p.strip() for p in text.replace(";", ",").split(",") if p.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="main.py discover",
+                                     description="List runnable scripts as a batch manifest (CSV on stdout).")
+    parser.add_argument("paths", nargs="+", help="Files or folders to search")
+    parser.add_argument("--include", action="append", help="Glob for files to consider (repeatable; default: *.py, *.pyw)")
+    parser.add_argument("--exclude", action="append", help="Glob for files or folders to skip (repeatable; "
+                                                           "default: hidden, virtualenv, build and test folders)")
+    parser.add_argument("--all", action="store_true", help="List every matching file, not just likely entry points")
+    args = parser.parse_args(argv)
+
+    candidates = list(scan(args.paths, args.include or DEFAULT_INCLUDE, args.exclude or DEFAULT_EXCLUDE,
+                           entry_points_only=not args.all))
+    writer = csv.writer(sys.stdout, lineterminator="\n")
+    writer.writerow(["script", "name"])
+    for candidate, name in zip(candidates, unique_names(candidates)):
+        writer.writerow([candidate.path, name])
+    print(f"{len(candidates)} script(s) found.", file=sys.stderr)
+    return 0 if candidates else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
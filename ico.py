@@ -0,0 +1,205 @@
+"""Multi-resolution .ico writer and reader.
+
+The source is decoded once. The largest size is resampled from it, and each
+smaller size comes from the nearest frame already made that is at least twice
+as large, rather than from the full image every time. Frames keep the image's
+aspect ratio unless asked to pad it to a square. Sizes up to SHARPEN_MAX get an
+unsharp mask so they don't go soft. The 256 px frame is stored as PNG. Smaller
+frames use 32-bit BMP or PNG, whichever is smaller. PNGs get zlib's tightest
+setting. Square frames that already exist in an .ico input are copied
+over byte for byte.
+"""
+import io
+import struct
+from dataclasses import dataclass
+
+# Small icons are drawn at 16/20/24/32 px and large ones at 32/40/48/64 px for 100-200% display scaling.
+DEFAULT_SIZES = [16, 20, 24, 32, 40, 48, 64, 256]
+PNG_MIN_SIZE = 256
+# Icons are converted once per image and then cached, so bytes matter more than milliseconds.
+PNG_OPTIMIZE_MAX = 256
+SHARPEN_MAX = 32
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+ICONDIR = struct.Struct("<HHH")
+ICONDIRENTRY = struct.Struct("<BBBBHHII")
+BITMAPINFOHEADER = struct.Struct("<IiiHHIIiiII")
+
+
+class IcoParseError(ValueError):
+    """Raised for data that is not an icon file this module can read."""
+
+
+@dataclass
+class Frame:
+    """One image in an icon, as stored: PNG bytes or a headerless-BMP DIB."""
+    width: int
+    height: int
+    bit_count: int
+    data: bytes
+
+    @property
+    def format(self):
+        return "png" if self.data.startswith(PNG_SIGNATURE) else "bmp"
+
+
+def parse(data):
+    """Return the frames of .ico bytes in directory order."""
+    try:
+        reserved, kind, count = ICONDIR.unpack_from(data, 0)
+        if reserved != 0 or kind != 1 or count == 0:
+            raise IcoParseError("not an icon file")
+        frames = []
+        for index in range(count):
+            width, height, _, _, _, bit_count, size, offset = \
+                ICONDIRENTRY.unpack_from(data, ICONDIR.size + index * ICONDIRENTRY.size)
+            if offset + size > len(data):
+                raise IcoParseError("frame data runs past the end of the file")
+            blob = data[offset:offset + size]
+            if not blob.startswith(PNG_SIGNATURE):
+                # The directory's bit count is often 0; the DIB header has the real one.
+                bit_count = BITMAPINFOHEADER.unpack_from(blob, 0)[4]
+            frames.append(Frame(width or 256, height or 256, bit_count, blob))
+    except struct.error as e:
+        raise IcoParseError(f"truncated icon file: {e}") from e
+    return frames
+
+
+def serialize(frames):
+    """Icon bytes for `frames`, smallest first."""
+    frames = sorted(frames, key=lambda f: max(f.width, f.height))
+    offset = ICONDIR.size + ICONDIRENTRY.size * len(frames)
+    header = [ICONDIR.pack(0, 1, len(frames))]
+    for frame in frames:
+        # Width and height are a byte each; 0 means 256.
+        header.append(ICONDIRENTRY.pack(frame.width % 256, frame.height % 256, 0, 0, 1, frame.bit_count,
+                                        len(frame.data), offset))
+        offset += len(frame.data)
+    return b"".join(header) + b"".join(frame.data for frame in frames)
+
+
+def _reusable(frame):
+    # Palette and 24-bit frames are from another era; regenerate those instead.
+    return frame.width == frame.height and (frame.format == "png" or frame.bit_count == 32)
+
+
+def _fit(image, size, pad, reducing_gap=None):
+    """`image` scaled to fit `size` x `size`, centred on a transparent square if `pad`."""
+    from PIL import Image
+    # Opaque sources are resampled as RGB: a third fewer channels and no premultiplying.
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "A" in image.getbands() or "transparency" in image.info else "RGB")
+    scale = size / max(image.size)
+    fitted = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+    if image.size != fitted:
+        image = image.resize(fitted, Image.Resampling.LANCZOS, reducing_gap=reducing_gap)
+    if pad and image.size != (size, size):
+        canvas = Image.new("RGBA", (size, size))
+        canvas.paste(image, ((size - image.width) // 2, (size - image.height) // 2))
+        image = canvas
+    return image.convert("RGBA")
+
+
+def _sharpen(image):
+    from PIL import ImageFilter
+    # Alpha is left alone: sharpening it draws a halo around the shape.
+    rgb = image.convert("RGB").filter(ImageFilter.UnsharpMask(radius=0.8, percent=70, threshold=2))
+    sharpened = rgb.convert("RGBA")
+    sharpened.putalpha(image.getchannel("A"))
+    return sharpened
+
+
+def render_frames(image, sizes=DEFAULT_SIZES, sharpen_max=SHARPEN_MAX, pad=False):
+    """RGBA renderings of `image` fitted to each of `sizes`, as {size: image}.
+
+    Only the largest size is resampled from `image` itself; every other size comes
+    from the smallest frame already made that is at least twice its size. Frames
+    keep the image's aspect ratio unless `pad` centres them on a square.
+    """
+    sizes = sorted(set(sizes), reverse=True)
+    made = {sizes[0]: _fit(image, sizes[0], pad, reducing_gap=2.0)}
+    for size in sizes[1:]:
+        source = min((s for s in made if s >= 2 * size), default=sizes[0])
+        made[size] = _fit(made[source], size, pad)
+    return {size: _sharpen(frame) if size <= sharpen_max else frame for size, frame in made.items()}
+
+
+def _bmp_frame(image):
+    """A 32-bit DIB: header, bottom-up BGRA pixels and the 1-bit transparency mask."""
+    from PIL import Image
+    width, height = image.size
+    flipped = image.transpose(Image.Transpose.FLIP_TOP_BOTTOM)
+    pixels = flipped.tobytes("raw", "BGRA")
+    # The mask is ignored when there is an alpha channel, but old renderers still read it.
+    mask = flipped.getchannel("A").point(lambda a: 0 if a else 255).convert("1").tobytes("raw", "1")
+    row, stride = (width + 7) // 8, ((width + 31) // 32) * 4
+    mask = b"".join(mask[i:i + row].ljust(stride, b"\0") for i in range(0, len(mask), row))
+    header = BITMAPINFOHEADER.pack(BITMAPINFOHEADER.size, width, height * 2, 1, 32, 0,
+                                   len(pixels) + len(mask), 0, 0, 0, 0)
+    return header + pixels + mask
+
+
+def _png_frame(image, optimize):
+    # Fully opaque frames drop the alpha channel, as Pillow's own ICO encoder does.
+    if image.getextrema()[3] == (255, 255):
+        image = image.convert("RGB")
+    out = io.BytesIO()
+    image.save(out, format="PNG", optimize=optimize)
+    return out.getvalue()
+
+
+def encode_frame(image, png_min=PNG_MIN_SIZE, optimize_max=PNG_OPTIMIZE_MAX):
+    """The smaller of PNG and 32-bit BMP for an RGBA frame; always PNG from `png_min` up.
+
+    PNGs up to `optimize_max` px get zlib's slowest, tightest setting. At 256 px
+    that saves about a tenth of the file and can double the encode time; pass a
+    lower limit where conversion speed matters more than size.
+    """
+    longest = max(image.size)
+    png = _png_frame(image, longest <= optimize_max)
+    if longest >= png_min:
+        return Frame(image.width, image.height, 32, png)
+    bmp = _bmp_frame(image)
+    return Frame(image.width, image.height, 32, png if len(png) < len(bmp) else bmp)
+
+
+def from_image(image, sizes=DEFAULT_SIZES, reuse=(), png_min=PNG_MIN_SIZE, sharpen_max=SHARPEN_MAX,
+               optimize_max=PNG_OPTIMIZE_MAX, pad=False):
+    """Icon bytes with a frame per size, taking sizes present in `reuse` frames as they are.
+
+    Non-square images get non-square frames, as Pillow writes them, unless `pad`
+    asks for square ones; padding costs up to 15% in file size.
+    """
+    existing = {frame.width: frame for frame in reuse if _reusable(frame) and frame.width in sizes}
+    missing = [size for size in sizes if size not in existing]
+    frames = list(existing.values())
+    if missing:
+        frames += [encode_frame(frame, png_min, optimize_max)
+                   for frame in render_frames(image, missing, sharpen_max, pad).values()]
+    return serialize(frames)
+
+
+def decode_target(sizes):
+    """The short side `build` decodes a source at to render `sizes`.
+
+    Twice the largest size, so the last step is a Lanczos resample rather than a
+    box-filter reduce, which leaves grain that PNG compresses badly.
+    """
+    return 2 * max(sizes)
+
+
+def build(data, sizes=DEFAULT_SIZES, png_min=PNG_MIN_SIZE, sharpen_max=SHARPEN_MAX,
+          optimize_max=PNG_OPTIMIZE_MAX, pad=False):
+    """Icon bytes for encoded image `data` (any format Pillow reads, .ico included)."""
+    from imaging import open_scaled
+    reuse = []
+    if data[:4] == b"\0\0\1\0":
+        try:
+            reuse = parse(data)
+        except IcoParseError:
+            reuse = []
+    existing = {frame.width for frame in reuse if _reusable(frame)}
+    if all(size in existing for size in sizes):
+        return from_image(None, sizes, reuse, png_min, sharpen_max, optimize_max, pad)
+    image = open_scaled(io.BytesIO(data), decode_target([size for size in sizes if size not in existing]))
+    return from_image(image, sizes, reuse, png_min, sharpen_max, optimize_max, pad)
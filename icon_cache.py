@@ -0,0 +1,185 @@
+"""Content-addressed store for converted .ico files.
+
+Icons are keyed by a hash of the source image bytes plus the requested size set,
+so twenty shortcuts sharing one logo share one .ico. An index next to the icons
+records size, last use and which shortcuts point at each entry.
+
+    python main.py icons stats
+    python main.py icons prune        # drop icons no existing shortcut uses
+"""
+import argparse
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+INDEX_NAME = "index.json"
+
+
+def app_cache_dir():
+    """The per-user folder all of the app's caches, state and logs live under."""
+    base = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME") \
+        or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "TaskbarPinner")
+
+
+def default_cache_dir():
+    return os.path.join(app_cache_dir(), "icons")
+
+
+def icon_key(data, sizes):
+    h = hashlib.sha256()
+    h.update(repr(sorted(tuple(s) for s in sizes)).encode())
+    h.update(b"\0")
+    h.update(data)
+    return h.hexdigest()
+
+
+def write_atomic(path, data):
+    """Write `data` to `path` through a temp file, so readers never see half of it."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+class IconCache:
+    """A size-bounded LRU of converted icons living in `root`.
+
+    Entries that an existing shortcut still references are never evicted, so the
+    bound only applies to icons nothing points at any more.
+    """
+    def __init__(self, root=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = os.path.abspath(root or default_cache_dir())
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(self.root, INDEX_NAME)
+        self.entries = {}
+        self.dirty = False
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                self.entries = json.load(f).get("entries", {})
+        except (OSError, ValueError):
+            self.entries = {}
+        # Drop index rows whose file was deleted behind our back.
+        for key in [k for k in self.entries if not os.path.exists(self.path_for(k))]:
+            del self.entries[key]
+            self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        write_atomic(self.index_path, json.dumps({"entries": self.entries}, indent=1).encode("utf-8"))
+        self.dirty = False
+
+    def path_for(self, key):
+        return os.path.join(self.root, f"{key}.ico")
+
+    def total_bytes(self):
+        return sum(entry["bytes"] for entry in self.entries.values())
+
+    def get_or_create(self, image, sizes, convert, ref=None):
+        """Return the cached .ico for `image`, calling `convert(src, dest, sizes)` on a miss.
+
+        `src` is a file-like object holding the image bytes already read for hashing.
+        """
+        with open(image, "rb") as f:
+            data = f.read()
+        key = icon_key(data, sizes)
+        path = self.path_for(key)
+        entry = self.entries.get(key)
+
+        if entry is None or not os.path.exists(path):
+            out = io.BytesIO()
+            convert(io.BytesIO(data), out, sizes)
+            entry = self.put(key, out.getvalue(), image, sizes)
+
+        entry["last_used"] = time.time()
+        if ref:
+            self._claim(key, os.path.abspath(ref))
+        self.dirty = True
+        self.evict(keep=key)
+        return path
+
+    def _claim(self, key, ref):
+        """Record that `ref` points at `key` and at no other entry any more."""
+        for other, entry in self.entries.items():
+            refs = entry.setdefault("refs", [])
+            if other == key:
+                if ref not in refs:
+                    refs.append(ref)
+            elif ref in refs:
+                refs.remove(ref)
+
+    def contains(self, key):
+        return key in self.entries and os.path.exists(self.path_for(key))
+
+    def put(self, key, data, source, sizes):
+        """Store already-converted .ico bytes under `key` and return the new index entry."""
+        write_atomic(self.path_for(key), data)
+        entry = self.entries[key] = {"bytes": len(data), "source": os.path.abspath(source),
+                                     "sizes": [list(s) for s in sizes], "refs": [],
+                                     "last_used": time.time()}
+        self.dirty = True
+        self.evict(keep=key)
+        return entry
+
+    def in_use(self, entry):
+        return any(os.path.exists(ref) for ref in entry.get("refs", []))
+
+    def evict(self, keep=None):
+        total = self.total_bytes()
+        if total <= self.max_bytes:
+            return []
+        removed = []
+        for key in sorted(self.entries, key=lambda k: self.entries[k].get("last_used", 0)):
+            if total <= self.max_bytes:
+                break
+            entry = self.entries[key]
+            if key == keep or self.in_use(entry):
+                continue
+            total -= entry["bytes"]
+            self._remove(key)
+            removed.append(key)
+        return removed
+
+    def prune(self):
+        """Remove every entry that no existing shortcut references."""
+        removed = [key for key, entry in self.entries.items() if not self.in_use(entry)]
+        for key in removed:
+            self._remove(key)
+        return removed
+
+    def _remove(self, key):
+        try:
+            os.remove(self.path_for(key))
+        except FileNotFoundError:
+            pass
+        del self.entries[key]
+        self.dirty = True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="main.py icons", description="Inspect or prune the icon cache.")
+    parser.add_argument("command", choices=["stats", "prune"])
+    parser.add_argument("--cache-dir", help="Icon cache folder (default: %(default)s)", default=default_cache_dir())
+    args = parser.parse_args(argv)
+
+    cache = IconCache(args.cache_dir)
+    if args.command == "prune":
+        removed = cache.prune()
+        cache.save()
+        print(f"Removed {len(removed)} unreferenced icon(s).")
+    in_use = sum(1 for entry in cache.entries.values() if cache.in_use(entry))
+    print(f"{len(cache.entries)} icon(s), {in_use} in use, {cache.total_bytes() / 1024:.1f} KiB in {cache.root}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+"""Parallel image-to-ICO conversion for batch runs.
+
+Pillow's resize-and-encode is CPU-bound, so bulk runs spread it over a process
+pool. Results stream back in completion order. At most `max_pending` images are
+in flight at once, which bounds memory however long the input is, and each item
+is isolated: a corrupt image, a timeout or even a crashed worker only fails that
+item, and other items caught up in a pool restart are run again.
+"""
+import io
+import os
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+
+from icon_cache import icon_key
+
+
+@dataclass
+class ConversionResult:
+    """Outcome of converting one source image."""
+    source: str
+    key: str = ""
+    data: bytes = b""
+    error: str = ""
+    seconds: float = 0.0
+
+    @property
+    def ok(self):
+        return not self.error
+
+
+def default_workers():
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+def _convert_job(data, sizes):
+    from shortcuts import convert_icon
+    started = time.perf_counter()
+    out = io.BytesIO()
+    convert_icon(io.BytesIO(data), out, sizes)
+    return out.getvalue(), time.perf_counter() - started
+
+
+@dataclass
+class _Item:
+    source: str
+    key: str
+    data: bytes
+    isolated: bool = False
+    started: float = 0.0
+
+
+def _kill(pool):
+    """Stop `pool` now, killing workers mid-job; its unfinished futures fail."""
+    kill_workers = getattr(pool, "kill_workers", None)  # Python 3.14+
+    if kill_workers:
+        kill_workers()
+    else:
+        for process in list((pool._processes or {}).values()):
+            process.kill()
+    pool.shutdown(wait=True, cancel_futures=True)
+
+
+def convert_many(jobs, sizes, workers=None, max_pending=None, timeout=None):
+    """Convert `(source, data)` pairs, yielding ConversionResult as each finishes.
+
+    `timeout` is counted from when an item is handed to the pool. A timed-out item
+    is reported as failed and its worker killed. Other items that were in flight
+    when a worker was killed or crashed are run again on a fresh pool; after a
+    crash they run one at a time, so only the item that crashes again fails.
+    """
+    workers = workers or default_workers()
+    max_pending = max(max_pending or workers * 2, 1)
+    jobs = iter(jobs)
+    pending = {}
+    suspects = deque()
+    pool = ProcessPoolExecutor(max_workers=workers)
+
+    def submit(item):
+        item.started = time.monotonic()
+        pending[pool.submit(_convert_job, item.data, sizes)] = item
+
+    def fill():
+        if suspects:
+            if not pending:
+                submit(suspects.popleft())
+            return
+        while len(pending) < max_pending:
+            for source, data in jobs:
+                submit(_Item(source, icon_key(data, sizes), data))
+                break
+            else:
+                return
+
+    def result_of(future, item):
+        try:
+            data, seconds = future.result()
+            return ConversionResult(item.source, item.key, data, seconds=seconds)
+        except Exception as e:
+            return ConversionResult(item.source, item.key, error=str(e) or type(e).__name__)
+
+    try:
+        fill()
+        while pending:
+            wait_for = None
+            if timeout is not None:
+                oldest = min(item.started for item in pending.values())
+                wait_for = max(0.0, oldest + timeout - time.monotonic())
+            done, _ = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+
+            crashed = []
+            for future in done:
+                item = pending.pop(future)
+                if isinstance(future.exception(), BrokenProcessPool):
+                    crashed.append(item)
+                else:
+                    yield result_of(future, item)
+
+            timed_out = False
+            if not crashed and timeout is not None:
+                now = time.monotonic()
+                for future, item in list(pending.items()):
+                    if now - item.started >= timeout:
+                        del pending[future]
+                        timed_out = True
+                        yield ConversionResult(item.source, item.key, error=f"Timed out after {timeout:g}s.",
+                                               seconds=now - item.started)
+
+            if crashed or timed_out:
+                # A crashed worker breaks the whole pool, and a stuck one can only be
+                # killed; either way, replace the pool and rescue what was in flight.
+                _kill(pool)
+                stranded = []
+                for future, item in pending.items():
+                    if not future.cancelled() and future.exception() is None:
+                        yield result_of(future, item)
+                    else:
+                        stranded.append(item)
+                pending.clear()
+                pool = ProcessPoolExecutor(max_workers=workers)
+                if crashed:
+                    crashed += stranded
+                    if len(crashed) == 1 or crashed[0].isolated:
+                        item = crashed[0]
+                        yield ConversionResult(item.source, item.key, error="The conversion worker crashed.")
+                    else:
+                        # Any of these could be the culprit; rerun each alone to find out.
+                        for item in crashed:
+                            item.isolated = True
+                        suspects.extend(crashed)
+                else:
+                    for item in stranded:
+                        submit(item)
+            fill()
+    finally:
+        if pending:
+            _kill(pool)
+        else:
+            pool.shutdown(wait=True)
+
+
+def warm_cache(cache, images, sizes, workers=None, timeout=None, on_result=None):
+    """Convert every image not already in `cache` in parallel.
+
+    Returns {image path: error message} for the images that could not be converted.
+    """
+    def jobs():
+        seen = set()
+        for image in images:
+            if not image or image in seen or not os.path.exists(image):
+                continue
+            seen.add(image)
+            try:
+                with open(image, "rb") as f:
+                    data = f.read()
+            except OSError as e:
+                failures[image] = str(e)
+                continue
+            if not cache.contains(icon_key(data, sizes)):
+                yield image, data
+
+    failures = {}
+    for result in convert_many(jobs(), sizes, workers, timeout=timeout):
+        if result.ok:
+            cache.put(result.key, result.data, result.source, sizes)
+        else:
+            failures[result.source] = result.error
+        if on_result:
+            on_result(result)
+    return failures
@@ -0,0 +1,58 @@
+"""Decode source images no larger than the output actually needs.
+
+A 12000x8000 photo only ever becomes a 256 px icon, so decoding it at full size
+wastes memory and time. JPEGs are decoded straight at a reduced scale (draft
+mode). Other formats are cut down with Image.reduce before the final
+high-quality resample. Multi-resolution inputs (.ico, multi-page TIFF) use the
+closest existing frame instead of the first one.
+"""
+from PIL import Image
+
+
+def _pick_size(sizes, target):
+    """Smallest size whose short side still covers `target`, else the largest."""
+    big_enough = [s for s in sizes if min(s) >= target]
+    if big_enough:
+        return min(big_enough, key=lambda s: s[0] * s[1])
+    return max(sizes, key=lambda s: s[0] * s[1])
+
+
+def best_frame(img, target):
+    if img.format == "ICO":
+        return img.ico.getimage(_pick_size(img.ico.sizes(), target))
+
+    frames = getattr(img, "n_frames", 1)
+    if frames > 1 and img.format == "TIFF":
+        sizes = []
+        for index in range(frames):
+            img.seek(index)
+            sizes.append(img.size)
+        img.seek(sizes.index(_pick_size(sizes, target)))
+    return img
+
+
+def reduce_to(img, target):
+    """Shrink `img` cheaply while keeping its short side at or above `target`."""
+    factor = min(img.size) // target
+    if factor < 2:
+        return img
+    if img.mode in ("1", "P"):
+        # Averaging palette indices is meaningless; reduce real colours instead.
+        img = img.convert("RGBA")
+    elif img.format == "JPEG":
+        # Draft mode picks a DCT scale of 1/2, 1/4 or 1/8 at least as large as requested.
+        img.draft(img.mode, (img.width // factor, img.height // factor))
+        factor = min(img.size) // target
+        if factor < 2:
+            return img
+    return img.reduce(factor)
+
+
+def open_scaled(src, target):
+    """Open `src` and return an image whose short side is between `target` and ~2x `target`.
+
+    Images already smaller than that are returned untouched.
+    """
+    img = Image.open(src)
+    img = best_frame(img, target)
+    return reduce_to(img, target)
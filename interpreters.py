@@ -0,0 +1,168 @@
+"""Pick the interpreter a script should run with.
+
+In order of preference:
+
+1. a virtualenv (`.venv`, `venv`, `env` holding a `pyvenv.cfg`) or conda env
+   (`conda-meta`) in the script's folder or any parent folder,
+2. an absolute interpreter path in the script's shebang,
+3. a versioned shebang (`#!/usr/bin/env python3.11`, `#! python3`) through the
+   Windows `py` launcher,
+4. the interpreter running this app.
+
+Each gets its windowed variant (pythonw.exe / pyw.exe) when the console should be
+hidden, if one exists. Folder scans are memoized per directory and persisted,
+keyed on the directory's mtime, which changes whenever an env folder is created
+or removed, so batches over thousands of scripts don't re-walk the tree.
+"""
+import json
+import os
+import re
+import shutil
+import sys
+from dataclasses import dataclass
+
+from icon_cache import app_cache_dir, write_atomic
+
+ENV_DIR_NAMES = (".venv", "venv", "env")
+IS_WINDOWS = os.name == "nt"
+SHEBANG_VERSION = re.compile(r"python(\d+(?:\.\d+)?)?(?:w|\.exe)?$", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class Interpreter:
+    """An executable plus any arguments that go before the script path."""
+    path: str
+    args: str = ""
+    source: str = "default"
+
+
+def default_cache_path():
+    return os.path.join(app_cache_dir(), "interpreters.json")
+
+
+def env_executable(env_dir, hide_console):
+    """The interpreter inside a venv or conda env, or None if there isn't one."""
+    if IS_WINDOWS:
+        candidates = [os.path.join(env_dir, "Scripts"), env_dir]
+        names = ["pythonw.exe", "python.exe"] if hide_console else ["python.exe"]
+    else:
+        candidates = [os.path.join(env_dir, "bin")]
+        names = ["python3", "python"]
+    for folder in candidates:
+        for name in names:
+            path = os.path.join(folder, name)
+            if os.path.isfile(path):
+                return path
+    return None
+
+
+def windowed_variant(path, hide_console):
+    if not hide_console:
+        return path
+    folder, name = os.path.split(path)
+    stem, ext = os.path.splitext(name)
+    windowed = os.path.join(folder, f"{stem}w{ext}")
+    return windowed if os.path.isfile(windowed) else path
+
+
+def default_interpreter(hide_console):
+    python_exe_name = 'pythonw.exe' if hide_console else 'python.exe'
+    python_exe_path = os.path.join(os.path.dirname(sys.executable), python_exe_name)
+    if not os.path.exists(python_exe_path):
+        python_exe_path = sys.executable
+    return Interpreter(python_exe_path)
+
+
+def read_shebang(script):
+    try:
+        with open(script, "rb") as f:
+            first = f.readline(256)
+    except OSError:
+        return ""
+    if not first.startswith(b"#!"):
+        return ""
+    return first[2:].decode("utf-8", errors="replace").strip()
+
+
+def _scan_dir(directory):
+    """Return the env folder directly inside (or being) `directory`, if any."""
+    if os.path.isfile(os.path.join(directory, "pyvenv.cfg")) or os.path.isdir(os.path.join(directory, "conda-meta")):
+        return directory
+    for name in ENV_DIR_NAMES:
+        candidate = os.path.join(directory, name)
+        if os.path.isfile(os.path.join(candidate, "pyvenv.cfg")) or os.path.isdir(os.path.join(candidate, "conda-meta")):
+            return candidate
+    return None
+
+
+class InterpreterResolver:
+    """Resolves scripts to interpreters, caching per-directory env lookups."""
+    def __init__(self, cache_path=None, persist=True):
+        self.cache_path = (cache_path or default_cache_path()) if persist else None
+        self.dirs = {}
+        self.checked = {}
+        self.dirty = False
+        if self.cache_path:
+            try:
+                with open(self.cache_path, encoding="utf-8") as f:
+                    self.dirs = json.load(f).get("dirs", {})
+            except (OSError, ValueError):
+                self.dirs = {}
+
+    def save(self):
+        if not self.cache_path or not self.dirty:
+            return
+        write_atomic(self.cache_path, json.dumps({"dirs": self.dirs}).encode("utf-8"))
+        self.dirty = False
+
+    def _env_in(self, directory):
+        # Each directory is validated against its mtime once per resolver.
+        if directory in self.checked:
+            return self.checked[directory]
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            self.checked[directory] = None
+            return None
+        cached = self.dirs.get(directory)
+        if cached and cached[0] == mtime:
+            env = cached[1]
+        else:
+            env = _scan_dir(directory)
+            self.dirs[directory] = [mtime, env]
+            self.dirty = True
+        self.checked[directory] = env
+        return env
+
+    def find_env(self, script):
+        directory = os.path.dirname(os.path.abspath(script))
+        while True:
+            env = self._env_in(directory)
+            if env:
+                return env
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                return None
+            directory = parent
+
+    def resolve(self, script, hide_console=False):
+        env = self.find_env(script)
+        if env:
+            path = env_executable(env, hide_console)
+            if path:
+                return Interpreter(path, source=f"env {env}")
+
+        shebang = read_shebang(script)
+        if shebang:
+            command = shebang.split()
+            if command[0].endswith("env") and len(command) > 1:
+                command = command[1:]
+            program = command[0]
+            if os.path.isabs(program) and os.path.isfile(program):
+                return Interpreter(windowed_variant(program, hide_console), source="shebang")
+            match = SHEBANG_VERSION.search(os.path.basename(program))
+            launcher = shutil.which("pyw" if hide_console else "py") if IS_WINDOWS else None
+            if match and match.group(1) and launcher:
+                return Interpreter(launcher, f"-{match.group(1)}", source="py launcher")
+
+        return default_interpreter(hide_console)
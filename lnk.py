@@ -0,0 +1,178 @@
+"""Minimal Shell Link (.lnk) serializer following [MS-SHLLINK].
+
+Only the parts a taskbar shortcut needs are written: the header, a LinkInfo
+structure pointing at the target's local path, the StringData fields and the
+terminal ExtraData block. Everything is built in memory, so the output can be
+compared byte-for-byte on any platform. `parse` reads the same fields back from
+any .lnk, including ones written by WScript.Shell.
+"""
+import struct
+import uuid
+from dataclasses import dataclass
+
+HEADER_SIZE = 0x4C
+LINK_CLSID = uuid.UUID("00021401-0000-0000-C000-000000000046").bytes_le
+
+# LinkFlags
+HAS_LINK_TARGET_ID_LIST = 0x00000001
+HAS_LINK_INFO = 0x00000002
+HAS_NAME = 0x00000004
+HAS_RELATIVE_PATH = 0x00000008
+HAS_WORKING_DIR = 0x00000010
+HAS_ARGUMENTS = 0x00000020
+HAS_ICON_LOCATION = 0x00000040
+IS_UNICODE = 0x00000080
+
+FILE_ATTRIBUTE_ARCHIVE = 0x20
+DRIVE_FIXED = 3
+VOLUME_ID_AND_LOCAL_BASE_PATH = 0x1
+
+SW_SHOWNORMAL = 1
+SW_SHOWMAXIMIZED = 3
+SW_SHOWMINNOACTIVE = 7
+SHOW_COMMANDS = {"normal": SW_SHOWNORMAL, "maximized": SW_SHOWMAXIMIZED, "minimized": SW_SHOWMINNOACTIVE}
+
+
+@dataclass
+class ShellLink:
+    """The fields of a .lnk file this app cares about."""
+    target: str
+    arguments: str = ""
+    working_dir: str = ""
+    icon_location: str = ""
+    icon_index: int = 0
+    show_command: int = SW_SHOWNORMAL
+    description: str = ""
+
+    def to_bytes(self):
+        return serialize(self)
+
+
+def _string_data(value):
+    encoded = value.encode("utf-16-le")
+    return struct.pack("<H", len(encoded) // 2) + encoded
+
+
+def _link_info(path):
+    volume_id = struct.pack("<IIII", 0x11, DRIVE_FIXED, 0, 0x10) + b"\0"
+    ansi_path = path.encode("cp1252", errors="replace") + b"\0"
+    suffix = b"\0"
+
+    # Paths that don't survive the ANSI code page also get the Unicode variants,
+    # which require the larger 0x24-byte header.
+    needs_unicode = ansi_path[:-1].decode("cp1252", errors="replace") != path
+    header_size = 0x24 if needs_unicode else 0x1C
+
+    volume_offset = header_size
+    path_offset = volume_offset + len(volume_id)
+    suffix_offset = path_offset + len(ansi_path)
+    body = volume_id + ansi_path + suffix
+    offsets = [volume_offset, path_offset, 0, suffix_offset]
+
+    if needs_unicode:
+        unicode_path = path.encode("utf-16-le") + b"\0\0"
+        unicode_path_offset = header_size + len(body)
+        body += unicode_path + b"\0\0"
+        offsets += [unicode_path_offset, unicode_path_offset + len(unicode_path)]
+
+    size = header_size + len(body)
+    return struct.pack("<III", size, header_size, VOLUME_ID_AND_LOCAL_BASE_PATH) \
+        + struct.pack(f"<{len(offsets)}I", *offsets) + body
+
+
+def serialize(link):
+    flags = IS_UNICODE | HAS_LINK_INFO
+    strings = b""
+    # StringData fields must appear in this order.
+    for flag, value in ((HAS_NAME, link.description),
+                        (HAS_WORKING_DIR, link.working_dir),
+                        (HAS_ARGUMENTS, link.arguments),
+                        (HAS_ICON_LOCATION, link.icon_location)):
+        if value:
+            flags |= flag
+            strings += _string_data(value)
+
+    header = struct.pack(
+        "<I16sII8s8s8sIiIHHII",
+        HEADER_SIZE, LINK_CLSID, flags, FILE_ATTRIBUTE_ARCHIVE,
+        b"\0" * 8, b"\0" * 8, b"\0" * 8,
+        0, link.icon_index, link.show_command, 0, 0, 0, 0)
+
+    return header + _link_info(link.target) + strings + struct.pack("<I", 0)
+
+
+def write(link, path):
+    data = serialize(link)
+    with open(path, "wb") as f:
+        f.write(data)
+    return len(data)
+
+
+class LinkParseError(ValueError):
+    """Raised for data that is not a Shell Link this module can read."""
+
+
+def _c_string(data, offset, encoding):
+    if encoding == "utf-16-le":
+        end = offset
+        while data[end:end + 2] not in (b"\0\0", b""):
+            end += 2
+        return data[offset:end].decode(encoding)
+    end = data.find(b"\0", offset)
+    return data[offset:end if end >= 0 else len(data)].decode(encoding, errors="replace")
+
+
+def _parse_link_info(data):
+    size, header_size, flags = struct.unpack_from("<III", data, 0)
+    if not flags & VOLUME_ID_AND_LOCAL_BASE_PATH:
+        return ""
+    _, path_offset, _, suffix_offset = struct.unpack_from("<4I", data, 12)
+    if header_size >= 0x24:
+        unicode_path_offset, unicode_suffix_offset = struct.unpack_from("<II", data, 28)
+        return _c_string(data, unicode_path_offset, "utf-16-le") \
+            + _c_string(data, unicode_suffix_offset, "utf-16-le")
+    return _c_string(data, path_offset, "cp1252") + _c_string(data, suffix_offset, "cp1252")
+
+
+def parse(data):
+    """Read back the fields ShellLink models from .lnk bytes, whoever wrote them."""
+    try:
+        (header_size, clsid, flags, _, _, _, _, _, icon_index, show_command,
+         _, _, _, _) = struct.unpack_from("<I16sII8s8s8sIiIHHII", data, 0)
+        if header_size != HEADER_SIZE or clsid != LINK_CLSID:
+            raise LinkParseError("not a Shell Link file")
+
+        offset = HEADER_SIZE
+        if flags & HAS_LINK_TARGET_ID_LIST:
+            offset += 2 + struct.unpack_from("<H", data, offset)[0]
+        target = ""
+        if flags & HAS_LINK_INFO:
+            info_size = struct.unpack_from("<I", data, offset)[0]
+            target = _parse_link_info(data[offset:offset + info_size])
+            offset += info_size
+
+        strings = {}
+        width = 2 if flags & IS_UNICODE else 1
+        encoding = "utf-16-le" if flags & IS_UNICODE else "cp1252"
+        for flag in (HAS_NAME, HAS_RELATIVE_PATH, HAS_WORKING_DIR, HAS_ARGUMENTS, HAS_ICON_LOCATION):
+            if flags & flag:
+                count = struct.unpack_from("<H", data, offset)[0]
+                end = offset + 2 + count * width
+                if end > len(data):
+                    raise LinkParseError("string data runs past the end of the file")
+                strings[flag] = data[offset + 2:end].decode(encoding, errors="replace")
+                offset = end
+    except struct.error as e:
+        raise LinkParseError(f"truncated Shell Link: {e}") from e
+
+    return ShellLink(target=target or strings.get(HAS_RELATIVE_PATH, ""),
+                     arguments=strings.get(HAS_ARGUMENTS, ""),
+                     working_dir=strings.get(HAS_WORKING_DIR, ""),
+                     icon_location=strings.get(HAS_ICON_LOCATION, ""),
+                     icon_index=icon_index, show_command=show_command,
+                     description=strings.get(HAS_NAME, ""))
+
+
+def read(path):
+    with open(path, "rb") as f:
+        return parse(f.read())
@@ -1,20 +1,201 @@
 import sys
 import os
-import subprocess
+import time
+
+# Taken before anything heavy is imported, for --profile-startup.
+STARTED = time.perf_counter()
+
+HEADLESS_COMMANDS = {"batch": "batch", "sync": "sync", "icons": "icon_cache", "discover": "discovery"}
+
+if __name__ == "__main__" and len(sys.argv) > 1 and sys.argv[1] in HEADLESS_COMMANDS:
+    # Headless commands: hand off before PyQt6 is ever imported.
+    import importlib
+    command = importlib.import_module(HEADLESS_COMMANDS[sys.argv[1]])
+    # Spawned worker processes re-import __main__; point them at the small command module.
+    sys.modules["__main__"] = command
+    sys.exit(command.main(sys.argv[2:]))
+
+if __name__ == "__main__" and "--profile-startup" in sys.argv[1:]:
+    from startup_profile import main as profile_startup
+    sys.exit(profile_startup(os.path.abspath(__file__)))
+
+import threading
+from collections import OrderedDict
+
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                              QHBoxLayout, QLabel, QLineEdit, QPushButton,
-                             QFileDialog, QCheckBox, QFrame, QMessageBox)
-from PyQt6.QtCore import Qt, QSettings
-from PyQt6.QtGui import QPixmap, QDragEnterEvent, QDropEvent
-from PIL import Image
-import win32com.client
+                             QFileDialog, QCheckBox, QFrame, QMessageBox, QDialog,
+                             QTableWidget, QTableWidgetItem, QHeaderView, QDialogButtonBox,
+                             QListWidget, QListWidgetItem)
+from PyQt6.QtCore import Qt, QSettings, QObject, QRunnable, QThreadPool, QTimer, QEvent, pyqtSignal
+from PyQt6.QtGui import QPixmap, QImage, QImageReader, QDragEnterEvent, QDropEvent
+
+from themes import get_theme
+
+# Pillow, the shortcut writers and subprocess are only needed once the user acts,
+# so they are imported where they are used (or warmed after the first paint).
+
+PREVIEW_SIZE = 120
+
+
+def read_scaled_image(path, size):
+    """Decode `path` at no more than `size` px, using the closest frame of multi-image files.
+
+    QImageReader decodes JPEGs directly at the scaled size, so a huge photo never
+    exists in memory at full resolution just to draw a 120 px preview.
+    """
+    reader = QImageReader(path)
+    reader.setAutoTransform(True)
+
+    sizes = [reader.size()]
+    for index in range(1, reader.imageCount()):
+        if not reader.jumpToImage(index):
+            break
+        sizes.append(reader.size())
+    # Smallest frame that still covers the preview, else the largest one there is.
+    area = lambda s: s.width() * s.height()
+    big_enough = [s for s in sizes if min(s.width(), s.height()) >= size]
+    best_size = min(big_enough, key=area) if big_enough else max(sizes, key=area)
+    reader.jumpToImage(sizes.index(best_size))
+
+    if best_size.isValid() and (best_size.width() > size or best_size.height() > size):
+        reader.setScaledSize(best_size.scaled(size, size, Qt.AspectRatioMode.KeepAspectRatio))
+    return reader.read()
+
+
+def load_thumbnail(path, size):
+    image = read_scaled_image(path, size)
+    if image.isNull() or (image.width() <= size and image.height() <= size):
+        return image
+    return image.scaled(size, size, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+
+
+class ThumbnailCache:
+    """An LRU of scaled preview images keyed on (path, mtime, file size, thumbnail size).
+
+    Bounded by entry count and total bytes. With `disk_dir` set, thumbnails also
+    survive restarts as small PNGs, so even a fresh session skips the decoder. The
+    folder has its own, larger bounds; past them the least recently used files go.
+    """
+    def __init__(self, max_entries=64, max_bytes=16 * 1024 * 1024, disk_dir=None,
+                 max_disk_entries=1024, max_disk_bytes=32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.max_disk_entries = max_disk_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.images = OrderedDict()
+        self.total_bytes = 0
+
+    def _key(self, path, size):
+        st = os.stat(path)
+        return (os.path.abspath(path), st.st_mtime_ns, st.st_size, size)
+
+    def _disk_path(self, key):
+        import hashlib
+        return os.path.join(self.disk_dir, hashlib.sha1(repr(key).encode()).hexdigest() + ".png")
+
+    def get(self, path, size):
+        try:
+            key = self._key(path, size)
+        except OSError:
+            return QImage()
+
+        image = self.images.get(key)
+        if image is not None:
+            self.images.move_to_end(key)
+            return image
+
+        disk_path = self._disk_path(key) if self.disk_dir else None
+        image = QImage(disk_path) if disk_path and os.path.exists(disk_path) else QImage()
+        if not image.isNull():
+            try:
+                # The file's mtime is its last use, which is what trimming goes by.
+                os.utime(disk_path)
+            except OSError:
+                pass
+        else:
+            image = load_thumbnail(path, size)
+            if image.isNull():
+                return image
+            if disk_path:
+                os.makedirs(self.disk_dir, exist_ok=True)
+                image.save(disk_path, "PNG")
+                self._trim_disk()
+
+        self._add(key, image)
+        return image
+
+    def _trim_disk(self):
+        files = []
+        try:
+            with os.scandir(self.disk_dir) as it:
+                for entry in it:
+                    if entry.name.endswith(".png"):
+                        try:
+                            st = entry.stat()
+                        except OSError:
+                            continue
+                        files.append((st.st_mtime_ns, st.st_size, entry.path))
+        except OSError:
+            return
+        files.sort(reverse=True)
+        total = 0
+        for index, (_, size, path) in enumerate(files):
+            total += size
+            if index >= self.max_disk_entries or total > self.max_disk_bytes:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def _add(self, key, image):
+        self.images[key] = image
+        self.total_bytes += image.sizeInBytes()
+        while self.images and (len(self.images) > self.max_entries or self.total_bytes > self.max_bytes):
+            _, evicted = self.images.popitem(last=False)
+            self.total_bytes -= evicted.sizeInBytes()
+
+
+def set_style_property(widget, name, value):
+    """Flip a property the stylesheet matches on and re-polish only `widget`."""
+    if widget.property(name) == value:
+        return
+    widget.setProperty(name, value)
+    widget.style().unpolish(widget)
+    widget.style().polish(widget)
+
+
+def warm_up_imports():
+    """Import what "Create Shortcut" needs in the background, after the window is up."""
+    import shortcuts  # noqa: F401
+    import imaging  # noqa: F401
+    from PIL import IcoImagePlugin, PngImagePlugin  # noqa: F401
+
+
+class FirstPaintProbe(QObject):
+    """Calls `callback(seconds since STARTED)` once, after the watched widget first paints."""
+    def __init__(self, widget, callback):
+        super().__init__(widget)
+        self.callback = callback
+        widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint:
+            obj.removeEventFilter(self)
+            elapsed = time.perf_counter() - STARTED
+            # Let the paint itself finish before doing anything else.
+            QTimer.singleShot(0, lambda: self.callback(elapsed))
+        return False
 
 
 class FileDropWidget(QFrame):
     """A custom widget that combines a QLineEdit, buttons, and drag-and-drop functionality."""
-    def __init__(self, placeholder_text, browse_filter, show_clear_button=False, callback=None):
+    def __init__(self, placeholder_text, browse_filter, show_clear_button=False, callback=None, multi_callback=None):
         super().__init__()
         self.callback = callback
+        # Given several files or a folder, `multi_callback(paths)` gets them all instead.
+        self.multi_callback = multi_callback
         self.browse_filter = browse_filter
         
         self.setAcceptDrops(True)
@@ -48,27 +229,24 @@ class FileDropWidget(QFrame):
             layout.addWidget(self.clear_btn)
         else:
             self.clear_btn = None
-            
-        self.default_style = ""
-        self.hover_style = ""
 
-    def set_styles(self, default, hover):
-        self.default_style = default
-        self.hover_style = hover
-        self.setStyleSheet(self.default_style)
+    def set_drag_over(self, active):
+        set_style_property(self, "dragOver", active)
 
     def dragEnterEvent(self, event: QDragEnterEvent):
         if event.mimeData().hasUrls():
             event.acceptProposedAction()
-            self.setStyleSheet(self.hover_style)
+            self.set_drag_over(True)
             
     def dragLeaveEvent(self, event):
-        self.setStyleSheet(self.default_style)
+        self.set_drag_over(False)
         
     def dropEvent(self, event: QDropEvent):
-        self.setStyleSheet(self.default_style)
+        self.set_drag_over(False)
         files = [u.toLocalFile() for u in event.mimeData().urls()]
-        if files and self.callback:
+        if files and self.multi_callback and (len(files) > 1 or os.path.isdir(files[0])):
+            self.multi_callback(files)
+        elif files and self.callback:
             self.callback(files[0])
 
     def browse(self):
@@ -83,6 +261,278 @@ class FileDropWidget(QFrame):
     def setText(self, text):
         self.path_edit.setText(text)
 
+class JobCancelled(Exception):
+    """Raised inside a ShortcutJob once cancellation has been requested."""
+
+
+class ShortcutJobSignals(QObject):
+    progress = pyqtSignal(object, str)
+    finished = pyqtSignal(object, object)
+    failed = pyqtSignal(object, str)
+    cancelled = pyqtSignal(object)
+
+
+class ShortcutJob(QRunnable):
+    """Creates one shortcut on a pool thread and reports back through signals."""
+    def __init__(self, script, image, name, hide_console):
+        super().__init__()
+        self.script = script
+        self.image = image
+        self.name = name
+        self.hide_console = hide_console
+        self.signals = ShortcutJobSignals()
+        self.trace = None
+        self.queued_at = time.perf_counter()
+        self._cancel = threading.Event()
+        # App.jobs owns the job until it reports back; the pool must not delete it first.
+        self.setAutoDelete(False)
+
+    def label(self):
+        return self.name.strip() or os.path.basename(self.script)
+
+    def cancel(self):
+        self._cancel.set()
+
+    def _progress(self, message):
+        if self._cancel.is_set():
+            raise JobCancelled()
+        self.signals.progress.emit(self, f"{self.label()}: {message}")
+
+    def run(self):
+        from shortcuts import ShortcutError, create_shortcut
+        import tracing
+        # Always kept in memory for the details view; only logged when tracing is on.
+        self.trace = tracing.Trace("create_shortcut", log=bool(tracing.log_path()), shortcut=self.label(),
+                                   queued_ms=round((time.perf_counter() - self.queued_at) * 1000, 3))
+        try:
+            self._progress("Starting...")
+            result = create_shortcut(self.script, self.image, self.name, self.hide_console,
+                                     progress=self._progress, trace=self.trace)
+        except JobCancelled:
+            self.trace.finish("cancelled")
+            self.signals.cancelled.emit(self)
+        except ShortcutError as e:
+            self.trace.finish("error")
+            self.signals.failed.emit(self, str(e))
+        except Exception as e:
+            self.trace.finish("error")
+            self.signals.failed.emit(self, f"Unexpected error: {e}")
+        else:
+            # Finished by the GUI thread, after it has launched Explorer.
+            self.signals.finished.emit(self, result)
+
+
+class BatchJob(ShortcutJob):
+    """Creates many shortcuts, one after another, as a single queued job."""
+    def __init__(self, entries):
+        super().__init__("", "", f"{len(entries)} scripts", False)
+        self.entries = entries
+
+    def run(self):
+        from batch import run_batch
+
+        def on_result(item):
+            self._progress(f"{item['index'] + 1}/{len(self.entries)} {item['name'] or os.path.basename(item['script'])}")
+
+        try:
+            self._progress("Starting...")
+            results = run_batch(self.entries, on_result=on_result)
+        except JobCancelled:
+            self.signals.cancelled.emit(self)
+        except Exception as e:
+            self.signals.failed.emit(self, f"Unexpected error: {e}")
+        else:
+            self.signals.finished.emit(self, results)
+
+
+class ScanJobSignals(QObject):
+    found = pyqtSignal(object, list)
+    finished = pyqtSignal(object, bool)
+
+
+class ScanJob(QRunnable):
+    """Walks dropped folders on a pool thread, handing candidates over in small batches."""
+    BATCH_SECONDS = 0.1
+
+    def __init__(self, paths, include, exclude, entry_points_only):
+        super().__init__()
+        self.paths = paths
+        self.include = include
+        self.exclude = exclude
+        self.entry_points_only = entry_points_only
+        self.signals = ScanJobSignals()
+        self._cancel = threading.Event()
+        self.setAutoDelete(False)
+
+    def cancel(self):
+        self._cancel.set()
+
+    def run(self):
+        from discovery import scan
+        batch = []
+        last_emit = time.perf_counter()
+        for candidate in scan(self.paths, self.include, self.exclude, self.entry_points_only, self._cancel.is_set):
+            if self._cancel.is_set():
+                break
+            batch.append(candidate)
+            # One signal per batch keeps the GUI thread responsive however fast files turn up.
+            if time.perf_counter() - last_emit >= self.BATCH_SECONDS:
+                self.signals.found.emit(self, batch)
+                batch = []
+                last_emit = time.perf_counter()
+        if batch:
+            self.signals.found.emit(self, batch)
+        self.signals.finished.emit(self, self._cancel.is_set())
+
+
+class DiscoveryDialog(QDialog):
+    """Lists the scripts found under dropped files and folders as they are found."""
+    def __init__(self, paths, parent=None):
+        from discovery import DEFAULT_EXCLUDE, DEFAULT_INCLUDE
+        super().__init__(parent)
+        self.paths = paths
+        self.scan_job = None
+        self.scanning = False
+        self.scan_pool = QThreadPool(self)
+        self.scan_pool.setMaxThreadCount(1)
+        self.setWindowTitle("Pin Several Scripts")
+        self.resize(560, 520)
+        layout = QVBoxLayout(self)
+
+        layout.addWidget(QLabel("Include files matching"))
+        self.include_edit = QLineEdit(", ".join(DEFAULT_INCLUDE))
+        layout.addWidget(self.include_edit)
+        layout.addWidget(QLabel("Skip files and folders matching"))
+        self.exclude_edit = QLineEdit(", ".join(DEFAULT_EXCLUDE))
+        layout.addWidget(self.exclude_edit)
+
+        options = QHBoxLayout()
+        self.entry_points_cb = QCheckBox("Only scripts that look runnable")
+        self.entry_points_cb.setToolTip("A shebang, an if __name__ == \"__main__\" guard, a .pyw or a package __main__.py")
+        self.entry_points_cb.setChecked(True)
+        options.addWidget(self.entry_points_cb)
+        options.addStretch()
+        rescan_btn = QPushButton("Rescan")
+        rescan_btn.clicked.connect(self.start_scan)
+        options.addWidget(rescan_btn)
+        layout.addLayout(options)
+
+        self.list = QListWidget()
+        self.list.setUniformItemSizes(True)
+        self.list.itemChanged.connect(self.update_count)
+        layout.addWidget(self.list)
+
+        selection = QHBoxLayout()
+        self.status = QLabel()
+        selection.addWidget(self.status)
+        selection.addStretch()
+        for text, state in (("Select All", Qt.CheckState.Checked), ("Select None", Qt.CheckState.Unchecked)):
+            button = QPushButton(text)
+            button.clicked.connect(lambda _, state=state: self.set_all(state))
+            selection.addWidget(button)
+        layout.addLayout(selection)
+
+        self.buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        self.buttons.accepted.connect(self.accept)
+        self.buttons.rejected.connect(self.reject)
+        layout.addWidget(self.buttons)
+
+        self.start_scan()
+
+    def start_scan(self):
+        from discovery import split_patterns
+        self.stop_scan()
+        self.list.clear()
+        self.scanning = True
+        self.scan_job = ScanJob(self.paths, split_patterns(self.include_edit.text()),
+                                split_patterns(self.exclude_edit.text()), self.entry_points_cb.isChecked())
+        self.scan_job.signals.found.connect(self.add_candidates)
+        self.scan_job.signals.finished.connect(self.scan_finished)
+        self.scan_pool.start(self.scan_job)
+        self.update_count()
+
+    def stop_scan(self):
+        if self.scan_job is not None:
+            self.scan_job.cancel()
+            self.scan_pool.waitForDone()
+            self.scan_job = None
+
+    def add_candidates(self, job, candidates):
+        # Batches a replaced scan queued before it was cancelled.
+        if job is not self.scan_job:
+            return
+        self.list.blockSignals(True)
+        for candidate in candidates:
+            item = QListWidgetItem(f"{candidate.name}  —  {candidate.path}")
+            item.setData(Qt.ItemDataRole.UserRole, candidate)
+            item.setToolTip(candidate.reason or "matches the include patterns")
+            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+            item.setCheckState(Qt.CheckState.Checked)
+            self.list.addItem(item)
+        self.list.blockSignals(False)
+        self.update_count()
+
+    def scan_finished(self, job, cancelled):
+        if job is not self.scan_job:
+            return
+        self.scanning = False
+        self.update_count()
+
+    def set_all(self, state):
+        self.list.blockSignals(True)
+        for row in range(self.list.count()):
+            self.list.item(row).setCheckState(state)
+        self.list.blockSignals(False)
+        self.update_count()
+
+    def selected(self):
+        items = (self.list.item(row) for row in range(self.list.count()))
+        return [item.data(Qt.ItemDataRole.UserRole) for item in items if item.checkState() == Qt.CheckState.Checked]
+
+    def update_count(self, *args):
+        found = self.list.count()
+        self.status.setText(f"Scanning... {found} found" if self.scanning else f"{found} script(s) found")
+        count = len(self.selected())
+        ok = self.buttons.button(QDialogButtonBox.StandardButton.Ok)
+        ok.setText(f"Create {count} Shortcut{'s' if count != 1 else ''}")
+        ok.setEnabled(count > 0)
+
+    def done(self, result):
+        self.stop_scan()
+        super().done(result)
+
+
+class TraceDialog(QDialog):
+    """Per-step timings of the last shortcut run."""
+    def __init__(self, trace, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Last Run Details")
+        self.resize(560, 300)
+        layout = QVBoxLayout(self)
+
+        records = trace.records()
+        table = QTableWidget(len(records), 4)
+        table.setHorizontalHeaderLabels(["Step", "Time (ms)", "Outcome", "Details"])
+        table.verticalHeader().setVisible(False)
+        table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        for row, record in enumerate(records):
+            details = ", ".join(f"{k}={v}" for k, v in record.items()
+                                if k not in ("span", "start", "duration_ms", "outcome") and v is not None)
+            cells = [record["span"], f"{record['duration_ms']:.1f}", record["outcome"], details]
+            for column, text in enumerate(cells):
+                item = QTableWidgetItem(text)
+                if column == 1:
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                table.setItem(row, column, item)
+        table.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeMode.Stretch)
+        table.resizeColumnsToContents()
+        layout.addWidget(table)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+
 class App(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -95,6 +545,15 @@ class App(QMainWindow):
         self.script_path = ""
         self.image_path = ""
         
+        # One thread so queued jobs run in order and never race on the same shortcut name.
+        self.job_pool = QThreadPool(self)
+        self.job_pool.setMaxThreadCount(1)
+        self.jobs = []
+        
+        self.theme = None
+        self.thumbnails = None
+        self.last_trace = None
+        
         self.init_ui()
         self.apply_theme()
         
@@ -136,7 +595,8 @@ class App(QMainWindow):
         script_label.setObjectName("sectionLabel")
         content_layout.addWidget(script_label)
         self.script_selector = FileDropWidget(
-            "Drag & drop a .py file or click Browse", "Python Files (*.py *.pyw)", callback=self.handle_script_selection)
+            "Drag & drop .py files or folders, or click Browse", "Python Files (*.py *.pyw)",
+            callback=self.handle_script_selection, multi_callback=self.handle_script_drop)
         content_layout.addWidget(self.script_selector)
         
         # Image Selection
@@ -178,12 +638,32 @@ class App(QMainWindow):
         content_layout.addWidget(self.hide_console_cb, 0, Qt.AlignmentFlag.AlignCenter)
         
         content_layout.addStretch(1)
+        button_row = QHBoxLayout()
+        button_row.setSpacing(8)
         create_btn = QPushButton("Create Shortcut")
         create_btn.setObjectName("createButton")
         create_btn.clicked.connect(self.create_shortcut)
         create_btn.setCursor(Qt.CursorShape.PointingHandCursor)
         create_btn.setFixedHeight(50)
-        content_layout.addWidget(create_btn)
+        button_row.addWidget(create_btn)
+        
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.setObjectName("cancelButton")
+        self.cancel_btn.clicked.connect(self.cancel_jobs)
+        self.cancel_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.cancel_btn.setFixedSize(100, 50)
+        self.cancel_btn.hide()
+        button_row.addWidget(self.cancel_btn)
+
+        self.details_btn = QPushButton("Details")
+        self.details_btn.setObjectName("detailsButton")
+        self.details_btn.setToolTip("Timings of the last shortcut run")
+        self.details_btn.clicked.connect(self.show_details)
+        self.details_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.details_btn.setFixedSize(100, 50)
+        self.details_btn.hide()
+        button_row.addWidget(self.details_btn)
+        content_layout.addLayout(button_row)
         
         main_layout.addWidget(content)
         
@@ -198,98 +678,11 @@ class App(QMainWindow):
         self.update_preview()
 
     def apply_theme(self):
-        if self.dark_mode:
-            # --- Dark Theme Colors ---
-            bg_main = "#1a1a1a"
-            bg_secondary = "#252525"
-            bg_input = "#2a2a2a"
-            text_primary = "#e8e8e8"
-            text_secondary = "#a0a0a0"
-            border = "#3a3a3a"
-            accent = "#4a9eff"
-            btn_gray = "#3f3f3f"
-            btn_gray_hover = "#4a4a4a"
-            red = "#c94040"
-            red_hover = "#b33030"
-            
-            drop_default = f"background-color: {bg_input}; border: 1px solid {border}; border-radius: 8px;"
-            drop_hover = f"background-color: {bg_input}; border: 1px solid {accent}; border-radius: 8px;"
-            
-            stylesheet = f"""
-                QMainWindow {{ background-color: {bg_main}; }}
-                QWidget {{ color: {text_primary}; font-family: 'Segoe UI', system-ui, sans-serif; font-size: 10pt; }}
-                #header {{ background-color: {bg_secondary}; border-bottom: 1px solid {border}; }}
-                #title {{ font-size: 14pt; font-weight: 500; }}
-                QPushButton#themeButton {{ background-color: {bg_input}; border: 1px solid {border}; border-radius: 8px; font-size: 16pt; padding: 0; }}
-                QPushButton#themeButton:hover {{ background-color: {btn_gray_hover}; }}
-                #sectionLabel {{ font-size: 11pt; font-weight: 600; margin-bottom: 4px; }}
-                #fileDropWidget {{ {drop_default} }}
-                #fileDropWidget QLineEdit {{ background-color: transparent; border: none; padding-left: 10px; }}
-                QLineEdit {{ background-color: {bg_input}; border: 1px solid {border}; border-radius: 6px; padding: 0 15px; }}
-                QLineEdit:focus {{ border: 1px solid {accent}; }}
-                QPushButton {{ background-color: {bg_input}; border: 1px solid {border}; border-radius: 6px; font-weight: 500; }}
-                QPushButton#browseButton {{ background-color: {btn_gray}; }}
-                QPushButton#browseButton:hover {{ background-color: {btn_gray_hover}; }}
-                QPushButton#clearButton {{ background-color: {red}; border-color: {red}; color: white; }}
-                QPushButton#clearButton:hover {{ background-color: {red_hover}; border-color: {red_hover}; }}
-                QPushButton#createButton {{ background-color: {accent}; border: none; color: #ffffff; font-size: 11pt; font-weight: 600; border-radius: 8px; }}
-                QPushButton#createButton:hover {{ background-color: #3a8eef; }}
-                #previewLabel {{ color: {text_secondary}; font-weight: 600; margin-bottom: 5px; }}
-                #preview {{ background-color: {bg_input}; border: 1px solid {border}; border-radius: 8px; color: {text_secondary}; font-size: 9pt; }}
-                QCheckBox {{ spacing: 10px; }}
-                QCheckBox::indicator {{ width: 20px; height: 20px; border-radius: 4px; border: 2px solid {border}; background-color: {bg_input}; }}
-                QCheckBox::indicator:hover {{ border-color: {accent}; }}
-                QCheckBox::indicator:checked {{ background-color: {accent}; border-color: {accent}; image: url(data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iMTYiIGhlaWdodD0iMTYiIHZpZXdCb3g9IjAgMCAxNiAxNiIgZmlsbD0ibm9uZSIgeG1sbnM9Imh0dHA6Ly93d3cudzMub3JnLzIwMDAvc3ZnIj4KPHBhdGggZD0iTTEzLjMzMzMgNEw2IDExLjMzMzNMMi42NjY2NyA4IiBzdHJva2U9IndoaXRlIiBzdHJva2Utd2lkdGg9IjIiIHN0cm9rZS1saW5lY2FwPSJyb3VuZCIgc3Ryb2tlLWxpbmVqb2luPSJyb3VuZCIvPgo8L3N2Zz4K); }}
-                #statusBar {{ background-color: {bg_secondary}; border-top: 1px solid {border}; color: {text_secondary}; font-size: 9pt; }}
-            """
-        else:
-            # --- Light Theme Colors ---
-            bg_main = "#ffffff"
-            bg_secondary = "#f5f5f5"
-            bg_input = "#ffffff"
-            text_primary = "#1a1a1a"
-            text_secondary = "#666666"
-            border = "#e0e0e0"
-            accent = "#2563eb"
-            btn_gray = "#f0f0f0"
-            btn_gray_hover = "#e2e8f0"
-            red = "#e53e3e"
-            red_hover = "#c53030"
-
-            drop_default = f"background-color: {bg_input}; border: 1px solid {border}; border-radius: 8px;"
-            drop_hover = f"background-color: {bg_input}; border: 1px solid {accent}; border-radius: 8px;"
-            
-            stylesheet = f"""
-                QMainWindow {{ background-color: {bg_main}; }}
-                QWidget {{ color: {text_primary}; font-family: 'Segoe UI', system-ui, sans-serif; font-size: 10pt; }}
-                #header {{ background-color: {bg_secondary}; border-bottom: 1px solid {border}; }}
-                #title {{ font-size: 14pt; font-weight: 500; }}
-                QPushButton#themeButton {{ background-color: {bg_input}; border: 1px solid {border}; border-radius: 8px; font-size: 16pt; padding: 0; }}
-                QPushButton#themeButton:hover {{ background-color: {btn_gray_hover}; }}
-                #sectionLabel {{ font-size: 11pt; font-weight: 600; margin-bottom: 4px; }}
-                #fileDropWidget {{ {drop_default} }}
-                #fileDropWidget QLineEdit {{ background-color: transparent; border: none; padding-left: 10px; }}
-                QLineEdit {{ background-color: {bg_input}; border: 1px solid {border}; border-radius: 6px; padding: 0 15px; }}
-                QLineEdit:focus {{ border: 1px solid {accent}; }}
-                QPushButton {{ background-color: {bg_input}; border: 1px solid {border}; border-radius: 6px; font-weight: 500; }}
-                QPushButton#browseButton {{ background-color: {btn_gray}; }}
-                QPushButton#browseButton:hover {{ background-color: {btn_gray_hover}; }}
-                QPushButton#clearButton {{ background-color: {red}; border-color: {red}; color: black; }}
-                QPushButton#clearButton:hover {{ background-color: {red_hover}; border-color: {red_hover}; }}
-                QPushButton#createButton {{ background-color: {accent}; border: none; color: #ffffff; font-size: 11pt; font-weight: 600; border-radius: 8px; }}
-                QPushButton#createButton:hover {{ background-color: #1d4ed8; }}
-                #previewLabel {{ color: {text_secondary}; font-weight: 600; margin-bottom: 5px; }}
-                #preview {{ background-color: {bg_secondary}; border: 1px solid {border}; border-radius: 8px; color: {text_secondary}; font-size: 9pt; }}
-                QCheckBox {{ spacing: 10px; }}
-                QCheckBox::indicator {{ width: 20px; height: 20px; border-radius: 4px; border: 2px solid {border}; background-color: {bg_input}; }}
-                QCheckBox::indicator:hover {{ border-color: {accent}; }}
-                QCheckBox::indicator:checked {{ background-color: {accent}; border-color: {accent}; image: url(data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iMTYiIGhlaWdodD0iMTYiIHZpZXdCb3g9IjAgMCAxNiAxNiIgZmlsbD0ibm9uZSIgeG1sbnM9Imh0dHA6Ly93d3cudzMub3JnLzIwMDAvc3ZnIj4KPHBhdGggZD0iTTEzLjMzMzMgNEw2IDExLjMzMzNMMi42NjY2NyA4IiBzdHJva2U9IndoaXRlIiBzdHJva2Utd2lkdGg9IjIiIHN0cm9rZS1saW5lY2FwPSJyb3VuZCIgc3Ryb2tlLWxpbmVqb2luPSJyb3VuZCIvPgo8L3N2Zz4K); }}
-                #statusBar {{ background-color: {bg_secondary}; border-top: 1px solid {border}; color: {text_secondary}; font-size: 9pt; }}
-            """
-        
-        self.setStyleSheet(stylesheet)
-        self.script_selector.set_styles(drop_default, drop_hover)
-        self.image_selector.set_styles(drop_default, drop_hover)
+        theme = get_theme("dark" if self.dark_mode else "light")
+        if theme is self.theme:
+            return
+        self.theme = theme
+        self.setStyleSheet(theme.stylesheet)
         
     def toggle_theme(self):
         self.dark_mode = not self.dark_mode
@@ -308,6 +701,18 @@ class App(QMainWindow):
         else:
             self.update_status("Please select a .py or .pyw file.", is_error=True)
 
+    def handle_script_drop(self, paths):
+        dialog = DiscoveryDialog(paths, self)
+        if dialog.exec() != QDialog.DialogCode.Accepted:
+            return
+        from discovery import unique_names
+        candidates = dialog.selected()
+        hide_console = self.hide_console_cb.isChecked()
+        entries = [{"script": c.path, "icon": "", "name": name, "hide_console": hide_console}
+                   for c, name in zip(candidates, unique_names(candidates))]
+        if entries:
+            self.start_job(BatchJob(entries), self.on_batch_finished)
+
     def handle_image_selection(self, filepath):
         if filepath == "":
             self.image_path = ""
@@ -331,11 +736,9 @@ class App(QMainWindow):
             return
             
         try:
-            pixmap = QPixmap(self.image_path)
-            if not pixmap.isNull():
-                scaled = pixmap.scaled(120, 120, Qt.AspectRatioMode.KeepAspectRatio, 
-                                      Qt.TransformationMode.SmoothTransformation)
-                self.preview_frame.setPixmap(scaled)
+            image = self.thumbnail_cache().get(self.image_path, PREVIEW_SIZE)
+            if not image.isNull():
+                self.preview_frame.setPixmap(QPixmap.fromImage(image))
                 self.preview_frame.setText("")
             else:
                 self.preview_frame.setPixmap(QPixmap())
@@ -344,78 +747,137 @@ class App(QMainWindow):
             self.preview_frame.setPixmap(QPixmap())
             self.preview_frame.setText("Invalid\nImage")
             
+    def thumbnail_cache(self):
+        if self.thumbnails is None:
+            from icon_cache import app_cache_dir
+            self.thumbnails = ThumbnailCache(disk_dir=os.path.join(app_cache_dir(), "thumbnails"))
+        return self.thumbnails
+
     def update_status(self, message, is_error=False):
         self.status_bar.setText(message)
-        base_style = self.status_bar.styleSheet()
-        if is_error:
-            color = "#ff6b6b" if self.dark_mode else "#d32f2f"
-            self.status_bar.setStyleSheet(f"{base_style} color: {color};")
-        else:
-            self.apply_theme()
-            self.status_bar.setText(message)
+        set_style_property(self.status_bar, "error", is_error)
             
     def create_shortcut(self):
-        script = self.script_path
-        image = self.image_path
-        
-        if not script:
-            QMessageBox.critical(self, "Error", "Please select a Python script.")
+        from shortcuts import ShortcutError, validate_script
+        try:
+            validate_script(self.script_path)
+        except ShortcutError as e:
+            QMessageBox.critical(self, "Error", str(e))
             return
-            
-        if not os.path.exists(script):
-            QMessageBox.critical(self, "Error", "The selected Python script does not exist.")
+
+        self.start_job(ShortcutJob(self.script_path, self.image_path, self.name_input.text(),
+                                   self.hide_console_cb.isChecked()), self.on_job_finished)
+
+    def start_job(self, job, on_finished):
+        job.signals.progress.connect(self.on_job_progress)
+        job.signals.finished.connect(on_finished)
+        job.signals.failed.connect(self.on_job_failed)
+        job.signals.cancelled.connect(self.on_job_cancelled)
+        self.jobs.append(job)
+        self.job_pool.start(job)
+
+        self.cancel_btn.show()
+        if len(self.jobs) > 1:
+            self.update_status(f"Queued {job.label()} ({len(self.jobs)} pending).")
+        else:
+            self.update_status(f"Creating shortcut for {job.label()}...")
+
+    def cancel_jobs(self):
+        for job in list(self.jobs):
+            job.cancel()
+            # Jobs that haven't started yet can be pulled straight out of the queue.
+            if self.job_pool.tryTake(job):
+                self.on_job_cancelled(job)
+
+    def _job_done(self, job):
+        if job in self.jobs:
+            self.jobs.remove(job)
+        if not self.jobs:
+            self.cancel_btn.hide()
+        # Jobs pulled from the queue before starting never ran, so have nothing to show.
+        if job.trace is not None:
+            self.last_trace = job.trace
+            self.details_btn.show()
+
+    def show_details(self):
+        if self.last_trace is not None:
+            TraceDialog(self.last_trace, self).exec()
+
+    def on_job_progress(self, job, message):
+        self.update_status(message)
+
+    def on_job_finished(self, job, result):
+        self._job_done(job)
+        for warning in result.warnings:
+            QMessageBox.warning(self, "Warning", warning)
+
+        self.update_status(f"Shortcut created successfully! ({job.label()})" if self.jobs
+                           else "Shortcut created successfully!")
+        if self.jobs:
+            job.trace.finish("ok")
             return
-            
+
+        folder = os.path.dirname(result.shortcut_path)
+        is_link = result.shortcut_path.lower().endswith(".lnk")
+        if is_link:
+            message = (f"Shortcut created in {folder}.\n"
+                       "You can now right-click it and choose 'Pin to taskbar'.")
+        else:
+            message = (f"Launcher created in {folder}.\n"
+                       "It will show up in your applications menu, where you can add it to your dock or panel.")
+        # Timed too, so the run's total isn't a mystery when the user leaves the box open.
+        with job.trace.span("success_dialog"):
+            QMessageBox.information(self, "Success!", message)
+
+        import shutil
+        import subprocess
         try:
-            script_dir = os.path.dirname(script)
-            
-            custom_name = self.name_input.text().strip()
-            shortcut_name = custom_name if custom_name else os.path.splitext(os.path.basename(script))[0]
-                
-            python_exe_name = 'pythonw.exe' if self.hide_console_cb.isChecked() else 'python.exe'
-            python_exe_path = os.path.join(os.path.dirname(sys.executable), python_exe_name)
-            if not os.path.exists(python_exe_path):
-                python_exe_path = sys.executable
-                
-            icon_location = python_exe_path
-            
-            if image:
-                if not os.path.exists(image):
-                    QMessageBox.warning(self, "Warning", "The selected image file does not exist. Using default icon.")
-                else:
-                    icon_path = os.path.join(script_dir, f"{shortcut_name}_icon.ico")
-                    try:
-                        img = Image.open(image)
-                        img.save(icon_path, format='ICO', sizes=[(32,32), (48,48), (64,64), (256,256)])
-                        icon_location = icon_path
-                    except Exception as e:
-                        QMessageBox.warning(self, "Warning", f"Could not convert image: {e}. Using Python's default icon.")
-                        icon_location = python_exe_path
-                
-            desktop_path = os.path.join(os.path.expanduser("~"), "Desktop")
-            shortcut_path = os.path.join(desktop_path, f"{shortcut_name}.lnk")
-            
-            shell = win32com.client.Dispatch("WScript.Shell")
-            shortcut = shell.CreateShortcut(shortcut_path)
-            shortcut.TargetPath = python_exe_path
-            shortcut.Arguments = f'"{script}"'
-            shortcut.WorkingDirectory = script_dir
-            shortcut.IconLocation = icon_location
-            shortcut.save()
-            
-            self.update_status("Shortcut created successfully!")
-            
-            QMessageBox.information(self, "Success!",
-                "Shortcut created on your Desktop.\nYou can now right-click it and choose 'Pin to taskbar'.")
-            
-            subprocess.run(f'explorer /select,"{shortcut_path}"', shell=True)
-            
-        except Exception as e:
-            self.update_status(f"Error: {e}", is_error=True)
-            QMessageBox.critical(self, "Error", f"Failed to create shortcut:\n{e}")
+            if is_link and sys.platform == "win32":
+                with job.trace.span("explorer"):
+                    subprocess.Popen(f'explorer /select,"{result.shortcut_path}"', shell=True)
+            elif not is_link and shutil.which("xdg-open"):
+                with job.trace.span("file_manager"):
+                    subprocess.Popen(["xdg-open", folder], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        finally:
+            job.trace.finish("ok")
+
+    def on_batch_finished(self, job, results):
+        self._job_done(job)
+        failures = [item for item in results if item["status"] == "error"]
+        created = len(results) - len(failures)
+        self.update_status(f"Created {created} shortcut{'s' if created != 1 else ''}"
+                           + (f", {len(failures)} failed." if failures else "."), is_error=bool(failures))
+        if failures:
+            lines = [f"{item['name'] or os.path.basename(item['script'])}: {item['error']}" for item in failures[:10]]
+            if len(failures) > 10:
+                lines.append(f"...and {len(failures) - 10} more.")
+            QMessageBox.warning(self, "Some shortcuts failed", "\n".join(lines))
+
+    def on_job_failed(self, job, message):
+        self._job_done(job)
+        self.update_status(f"Error: {message}", is_error=True)
+        QMessageBox.critical(self, "Error", f"Failed to create shortcut for {job.label()}:\n{message}")
+
+    def on_job_cancelled(self, job):
+        self._job_done(job)
+        self.update_status(f"Cancelled {job.label()}.")
+
+    def closeEvent(self, event):
+        self.cancel_jobs()
+        self.job_pool.waitForDone()
+        super().closeEvent(event)
+
+def on_first_paint(seconds):
+    if os.environ.get("PINNER_PROFILE_STARTUP"):
+        print(f"first_paint={time.time():.6f} since_main={seconds:.6f}", flush=True)
+        QApplication.quit()
+        return
+    threading.Thread(target=warm_up_imports, daemon=True).start()
+
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     window = App()
+    probe = FirstPaintProbe(window, on_first_paint)
     window.show()
     sys.exit(app.exec())
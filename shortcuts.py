@@ -0,0 +1,339 @@
+import os
+import sys
+from dataclasses import dataclass, field
+
+import desktop_entry
+import ico
+import lnk
+import tracing
+from icon_cache import IconCache, icon_key
+from interpreters import Interpreter, InterpreterResolver
+
+ICON_SIZES = [(s, s) for s in ico.DEFAULT_SIZES]
+
+
+class ShortcutError(Exception):
+    """Raised when a shortcut cannot be created at all."""
+
+
+@dataclass
+class ShortcutResult:
+    """What a single create_shortcut call produced."""
+    name: str
+    shortcut_path: str
+    target: str
+    icon_location: str
+    warnings: list = field(default_factory=list)
+
+
+def default_desktop():
+    return os.path.join(os.path.expanduser("~"), "Desktop")
+
+
+def shortcut_name_for(script, custom_name=""):
+    custom_name = (custom_name or "").strip()
+    return custom_name if custom_name else os.path.splitext(os.path.basename(script))[0]
+
+
+def convert_icon(src, dest, sizes=ICON_SIZES):
+    """Write an .ico for the image in `src` to `dest`; both may be paths or binary files."""
+    from PIL import UnidentifiedImageError
+    if hasattr(src, "read"):
+        data = src.read()
+    else:
+        with open(src, "rb") as f:
+            data = f.read()
+    try:
+        icon = ico.build(data, [max(size) for size in sizes])
+    except UnidentifiedImageError:
+        # Pillow's own message names the in-memory buffer rather than the file.
+        raise ValueError("unrecognised image format") from None
+    if hasattr(dest, "write"):
+        dest.write(icon)
+    else:
+        with open(dest, "wb") as f:
+            f.write(icon)
+
+
+@dataclass
+class ShortcutSpec:
+    """Backend-neutral description of one launcher.
+
+    `icon` holds whatever the backend's install_icon returned; empty means
+    "use the interpreter's own icon".
+    """
+    name: str
+    script: str
+    interpreter: Interpreter
+    terminal: bool = True
+    icon: str = ""
+
+    @property
+    def working_dir(self):
+        return os.path.dirname(self.script)
+
+    @property
+    def argv(self):
+        return [self.interpreter.path, *self.interpreter.args.split(), self.script]
+
+
+def link_for(spec):
+    """The ShellLink a .lnk for `spec` should contain."""
+    interpreter = spec.interpreter
+    arguments = f'{interpreter.args} "{spec.script}"' if interpreter.args else f'"{spec.script}"'
+    return lnk.ShellLink(interpreter.path, arguments, spec.working_dir, spec.icon or interpreter.path)
+
+
+class ShortcutBackend:
+    """Turns a ShortcutSpec into a launcher file. Subclasses pick the format and how."""
+    name = ""
+    extension = ""
+    icon_sizes = []
+    uses_icon_cache = False
+
+    def default_dir(self):
+        return default_desktop()
+
+    def icon_ref(self, key, icon_cache):
+        """What `ShortcutSpec.icon` will be for an image with content key `key`."""
+        raise NotImplementedError
+
+    def has_icon(self, key, icon_cache):
+        raise NotImplementedError
+
+    def install_icon(self, image, shortcut_path, icon_cache):
+        """Make `image` usable as this backend's icon and return its icon reference."""
+        raise NotImplementedError
+
+    def default_icon(self, spec):
+        """The icon reference written when `spec` has no icon of its own."""
+        return spec.interpreter.path
+
+    def write(self, spec, shortcut_path):
+        raise NotImplementedError
+
+    def fields(self, spec):
+        """The on-disk fields a launcher for `spec` should have, for comparison."""
+        raise NotImplementedError
+
+    def read_fields(self, shortcut_path):
+        """The same fields read back from an existing launcher."""
+        raise NotImplementedError
+
+    def finish(self):
+        """Called once after a run of writes."""
+
+
+class LinkBackend(ShortcutBackend):
+    """Windows .lnk shortcuts with .ico files from the shared icon cache."""
+    extension = ".lnk"
+    icon_sizes = ICON_SIZES
+    uses_icon_cache = True
+
+    def icon_ref(self, key, icon_cache):
+        return icon_cache.path_for(key)
+
+    def has_icon(self, key, icon_cache):
+        return icon_cache.contains(key)
+
+    def install_icon(self, image, shortcut_path, icon_cache):
+        return icon_cache.get_or_create(image, ICON_SIZES, convert_icon, ref=shortcut_path)
+
+    def write(self, spec, shortcut_path):
+        # A --desktop folder named in a manifest run may not exist yet.
+        os.makedirs(os.path.dirname(os.path.abspath(shortcut_path)), exist_ok=True)
+        self.write_link(link_for(spec), shortcut_path)
+
+    def write_link(self, link, shortcut_path):
+        raise NotImplementedError
+
+    def fields(self, spec):
+        link = link_for(spec)
+        return {"target": link.target, "arguments": link.arguments,
+                "working dir": link.working_dir, "icon": link.icon_location}
+
+    def read_fields(self, shortcut_path):
+        link = lnk.read(shortcut_path)
+        return {"target": link.target, "arguments": link.arguments,
+                "working dir": link.working_dir, "icon": link.icon_location}
+
+
+class ShellLinkBackend(LinkBackend):
+    """Serializes the .lnk in-process; works (and can be checked) on any platform."""
+    name = "builtin"
+
+    def write_link(self, link, shortcut_path):
+        lnk.write(link, shortcut_path)
+
+
+class ComLinkBackend(LinkBackend):
+    """The original WScript.Shell route. Windows only, one COM round-trip per shortcut."""
+    name = "com"
+
+    def write_link(self, link, shortcut_path):
+        import pythoncom
+        import win32com.client
+        # Needed once per thread; shortcuts may be written from a GUI worker thread.
+        pythoncom.CoInitialize()
+        shell = win32com.client.Dispatch("WScript.Shell")
+        shortcut = shell.CreateShortcut(shortcut_path)
+        shortcut.TargetPath = link.target
+        shortcut.Arguments = link.arguments
+        shortcut.WorkingDirectory = link.working_dir
+        shortcut.IconLocation = f"{link.icon_location},{link.icon_index}"
+        shortcut.WindowStyle = link.show_command
+        if link.description:
+            shortcut.Description = link.description
+        shortcut.save()
+
+
+class DesktopEntryBackend(ShortcutBackend):
+    """Freedesktop .desktop launchers with icons installed into the hicolor theme."""
+    name = "desktop"
+    extension = ".desktop"
+    icon_sizes = [(s, s) for s in desktop_entry.HICOLOR_SIZES]
+
+    def __init__(self, theme_dir=None):
+        self.theme_dir = theme_dir or desktop_entry.icon_theme_dir()
+        self.written_dirs = set()
+        self.icons_changed = False
+
+    def default_dir(self):
+        return desktop_entry.applications_dir()
+
+    def icon_ref(self, key, icon_cache):
+        return desktop_entry.icon_name(key)
+
+    def has_icon(self, key, icon_cache):
+        return desktop_entry.icon_installed(desktop_entry.icon_name(key), self.theme_dir)
+
+    def install_icon(self, image, shortcut_path, icon_cache):
+        with open(image, "rb") as f:
+            data = f.read()
+        name = desktop_entry.icon_name(icon_key(data, self.icon_sizes))
+        if not desktop_entry.icon_installed(name, self.theme_dir):
+            desktop_entry.install_icon(data, name, self.theme_dir)
+            self.icons_changed = True
+        return name
+
+    def default_icon(self, spec):
+        return "python3"
+
+    def entry_for(self, spec):
+        return desktop_entry.DesktopEntry(spec.name, spec.argv, spec.working_dir,
+                                          spec.icon or self.default_icon(spec), spec.terminal)
+
+    def write(self, spec, shortcut_path):
+        # ~/.local/share/applications doesn't exist on a fresh account.
+        os.makedirs(os.path.dirname(os.path.abspath(shortcut_path)), exist_ok=True)
+        desktop_entry.write(self.entry_for(spec), shortcut_path)
+        self.written_dirs.add(os.path.dirname(os.path.abspath(shortcut_path)))
+
+    def fields(self, spec):
+        entry = self.entry_for(spec)
+        return desktop_entry.parse(desktop_entry.serialize(entry))
+
+    def read_fields(self, shortcut_path):
+        with open(shortcut_path, encoding="utf-8") as f:
+            return desktop_entry.parse(f.read())
+
+    def finish(self):
+        # One database refresh per run, however many launchers were written.
+        apps = desktop_entry.applications_dir()
+        desktop_entry.refresh(apps, self.theme_dir, icons=self.icons_changed,
+                              entries=os.path.abspath(apps) in self.written_dirs)
+        self.written_dirs.clear()
+        self.icons_changed = False
+
+
+BACKENDS = {backend.name: backend for backend in (ShellLinkBackend, ComLinkBackend, DesktopEntryBackend)}
+DEFAULT_BACKEND = DesktopEntryBackend.name if sys.platform.startswith("linux") else ShellLinkBackend.name
+
+
+def get_backend(name=None):
+    try:
+        return BACKENDS[name or DEFAULT_BACKEND]()
+    except KeyError:
+        raise ShortcutError(f"Unknown shortcut backend '{name}'. Choose from: {', '.join(BACKENDS)}.") from None
+
+
+def validate_script(script):
+    if not script:
+        raise ShortcutError("Please select a Python script.")
+
+    if not os.path.exists(script):
+        raise ShortcutError("The selected Python script does not exist.")
+
+
+def create_shortcut(script, image="", name="", hide_console=False, desktop=None, backend=None,
+                    icon_cache=None, progress=None, resolver=None, trace=None):
+    """Create a launcher for `script`, installing `image` as its icon if one is given.
+
+    Problems that still allow a shortcut to be made (a missing or unreadable image)
+    are collected in `ShortcutResult.warnings`; anything else raises ShortcutError.
+    Pass a shared `backend`, `icon_cache` and `resolver` when creating many shortcuts,
+    then save the caches and call `backend.finish()` once at the end.
+    `progress(message)` is called before each step; it may raise to abandon the work.
+    Each step is timed into `trace`; without one, a trace is started (and logged)
+    only if tracing is switched on.
+    """
+    own_trace = trace is None
+    trace = tracing.start("create_shortcut", script=script) if own_trace else trace
+    try:
+        result = _create_shortcut(script, image, name, hide_console, desktop, backend,
+                                  icon_cache, progress or (lambda message: None), resolver, trace)
+    except BaseException:
+        if own_trace:
+            trace.finish("error")
+        raise
+    if own_trace:
+        trace.finish("ok")
+    return result
+
+
+def _create_shortcut(script, image, name, hide_console, desktop, backend, icon_cache, progress, resolver, trace):
+    with trace.span("validate") as span:
+        if trace.enabled:
+            span.set(script_bytes=tracing.file_size(script))
+        validate_script(script)
+
+    own_backend = backend is None
+    backend = backend or get_backend()
+    with trace.span("interpreter") as span:
+        interpreter = (resolver or InterpreterResolver(persist=False)).resolve(script, hide_console)
+        span.set(source=interpreter.source)
+    spec = ShortcutSpec(shortcut_name_for(script, name), script, interpreter, terminal=not hide_console)
+    warnings = []
+
+    shortcut_path = os.path.join(desktop or backend.default_dir(), f"{spec.name}{backend.extension}")
+
+    if image:
+        if not os.path.exists(image):
+            warnings.append("The selected image file does not exist. Using default icon.")
+        else:
+            progress("Converting icon...")
+            cache = icon_cache or IconCache()
+            with trace.span("icon", backend=backend.name) as span:
+                if trace.enabled:
+                    span.set(image_bytes=tracing.file_size(image))
+                try:
+                    spec.icon = backend.install_icon(image, shortcut_path, cache)
+                except Exception as e:
+                    warnings.append(f"Could not convert image: {e}. Using Python's default icon.")
+                    span.set(fallback=str(e))
+                if icon_cache is None:
+                    cache.save()
+
+    progress("Writing shortcut...")
+    with trace.span("write", backend=backend.name) as span:
+        try:
+            backend.write(spec, shortcut_path)
+            if own_backend:
+                backend.finish()
+        except Exception as e:
+            raise ShortcutError(str(e)) from e
+        if trace.enabled:
+            span.set(shortcut_bytes=tracing.file_size(shortcut_path))
+
+    return ShortcutResult(spec.name, shortcut_path, interpreter.path, spec.icon or backend.default_icon(spec),
+                          warnings)
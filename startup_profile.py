@@ -0,0 +1,69 @@
+"""Profile how long the window takes to appear.
+
+    python main.py --profile-startup [--top N]
+
+Launches the app in a child interpreter under `-X importtime`, waits for the
+window's first paint, then prints time-to-first-paint and the slowest imports.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+
+def parse_importtime(stderr):
+    """Return [(module, self_us, cumulative_us, depth)] from `-X importtime` output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            depth = (len(name) - len(name.lstrip())) // 2
+            rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+        except ValueError:
+            continue
+    return rows
+
+
+def by_package(rows):
+    totals = {}
+    for name, self_us, _, _ in rows:
+        package = name.split(".")[0]
+        totals[package] = totals.get(package, 0) + self_us
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+def main(script, argv=None):
+    parser = argparse.ArgumentParser(prog="main.py --profile-startup")
+    parser.add_argument("--profile-startup", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--top", type=int, default=15, help="How many imports to list (default: %(default)s)")
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+    env = dict(os.environ, PINNER_PROFILE_STARTUP="1")
+    launched = time.time()
+    proc = subprocess.run([sys.executable, "-X", "importtime", script], env=env,
+                          capture_output=True, text=True)
+
+    paint = next((line for line in proc.stdout.splitlines() if line.startswith("first_paint=")), None)
+    if paint is None:
+        print("The window never painted.", file=sys.stderr)
+        print(proc.stderr[-2000:], file=sys.stderr)
+        return 1
+    fields = dict(field.split("=") for field in paint.split())
+    rows = parse_importtime(proc.stderr)
+
+    print(f"Time to first paint:   {(float(fields['first_paint']) - launched) * 1000:8.1f} ms (from launch)")
+    print(f"  of which in main.py: {float(fields['since_main']) * 1000:8.1f} ms")
+    print(f"  imports:             {sum(r[1] for r in rows) / 1000:8.1f} ms over {len(rows)} modules")
+
+    print("\nSlowest top-level imports (cumulative):")
+    top_level = sorted((r for r in rows if r[3] == 0), key=lambda r: r[2], reverse=True)
+    for name, _, cumulative_us, _ in top_level[:args.top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+
+    print("\nSelf time by package:")
+    for package, self_us in by_package(rows)[:args.top]:
+        print(f"  {self_us / 1000:8.1f} ms  {package}")
+    return 0
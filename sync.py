@@ -0,0 +1,249 @@
+"""Reconcile a desired-state manifest against the shortcuts already on disk.
+
+    python main.py sync manifest.toml [--dry-run] [--desktop DIR]
+
+Takes the same manifests as batch mode. Each entry is compared with its existing
+launcher: target, arguments, working directory and icon (by content hash). Only the
+entries that differ are rewritten. Shortcuts a previous sync created that are no
+longer in the manifest are deleted; shortcuts sync never made are left alone.
+
+Icon hashes are remembered per source file (mtime + size), so re-applying an
+unchanged manifest only stats files and reads the small .lnk files back.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+from dataclasses import dataclass, field
+
+from batch import ManifestError, load_manifest
+from icon_cache import IconCache, app_cache_dir, icon_key, write_atomic
+from icon_pipeline import default_workers, warm_cache
+from interpreters import InterpreterResolver
+from shortcuts import (BACKENDS, DEFAULT_BACKEND, ShortcutError, ShortcutSpec, create_shortcut,
+                       get_backend, shortcut_name_for)
+
+CREATE, UPDATE, DELETE, UNCHANGED, ERROR = "create", "update", "delete", "unchanged", "error"
+
+
+@dataclass
+class Change:
+    """One step of a sync plan."""
+    action: str
+    name: str
+    shortcut_path: str
+    reasons: list = field(default_factory=list)
+    entry: dict = None
+
+
+def state_path(desktop):
+    digest = hashlib.sha1(os.path.abspath(desktop).lower().encode()).hexdigest()[:16]
+    return os.path.join(app_cache_dir(), "sync", f"{digest}.json")
+
+
+def load_state(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f).get("shortcuts", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(path, shortcuts):
+    write_atomic(path, json.dumps({"shortcuts": shortcuts}, indent=1).encode("utf-8"))
+
+
+class Planner:
+    """Works out the desired link for each entry, memoizing per-file lookups."""
+    def __init__(self, desktop, icon_cache, state, backend=None, resolver=None):
+        self.backend = backend or get_backend()
+        self.desktop = desktop or self.backend.default_dir()
+        self.icon_cache = icon_cache
+        self.state = state
+        self.resolver = resolver or InterpreterResolver()
+        self.known_icons = {}
+        # Hashes recorded by earlier runs, reusable while the source file is unchanged.
+        # Keys depend on the backend's icon sizes, so only reuse ones made by the same backend.
+        for record in state.values():
+            if record.get("icon_key") and record.get("backend") == self.backend.name:
+                self.known_icons[(record["icon"], tuple(record["icon_stat"]))] = record["icon_key"]
+
+    def icon_stamp(self, image):
+        st = os.stat(image)
+        return (st.st_mtime_ns, st.st_size)
+
+    def icon_key(self, image):
+        stamp = self.icon_stamp(image)
+        key = self.known_icons.get((image, stamp))
+        if key is None:
+            with open(image, "rb") as f:
+                key = icon_key(f.read(), self.backend.icon_sizes)
+            self.known_icons[(image, stamp)] = key
+        return key
+
+    def desired(self, entry):
+        """Return (fields the launcher should have, reasons the icon alone forces a rewrite)."""
+        interpreter = self.resolver.resolve(entry["script"], entry["hide_console"])
+        spec = ShortcutSpec(shortcut_name_for(entry["script"], entry["name"]), entry["script"],
+                            interpreter, terminal=not entry["hide_console"])
+        reasons = []
+        if entry["icon"] and os.path.exists(entry["icon"]):
+            key = self.icon_key(entry["icon"])
+            spec.icon = self.backend.icon_ref(key, self.icon_cache)
+            if not self.backend.has_icon(key, self.icon_cache):
+                reasons.append("icon not converted yet")
+        return self.backend.fields(spec), reasons
+
+    def change_for(self, entry):
+        name = shortcut_name_for(entry["script"], entry["name"])
+        path = os.path.join(self.desktop, f"{name}{self.backend.extension}")
+        if not entry["script"] or not os.path.exists(entry["script"]):
+            return Change(ERROR, name, path, ["script does not exist"], entry)
+
+        desired, reasons = self.desired(entry)
+        try:
+            existing = self.backend.read_fields(path)
+        except FileNotFoundError:
+            return Change(CREATE, name, path, ["missing"], entry)
+        except (OSError, ValueError) as e:
+            return Change(UPDATE, name, path, [f"unreadable ({e})"], entry)
+
+        for label, value in desired.items():
+            if os.path.normcase(existing.get(label, "")) != os.path.normcase(value):
+                reasons.append(label)
+        return Change(UPDATE if reasons else UNCHANGED, name, path, reasons, entry)
+
+    def plan(self, entries):
+        changes = []
+        seen = set()
+        for entry in entries:
+            change = self.change_for(entry)
+            if change.name.lower() in seen:
+                change = Change(ERROR, change.name, change.shortcut_path, ["duplicate shortcut name"], entry)
+            seen.add(change.name.lower())
+            changes.append(change)
+
+        for name, record in self.state.items():
+            if name.lower() not in seen and os.path.exists(record["shortcut"]):
+                changes.append(Change(DELETE, name, record["shortcut"], ["no longer in manifest"]))
+        return changes
+
+
+def _record(planner, change):
+    entry = change.entry
+    record = {"shortcut": change.shortcut_path, "script": entry["script"], "icon": entry["icon"],
+              "backend": planner.backend.name, "icon_stat": None, "icon_key": None}
+    if entry["icon"] and os.path.exists(entry["icon"]):
+        record["icon_stat"] = list(planner.icon_stamp(entry["icon"]))
+        record["icon_key"] = planner.icon_key(entry["icon"])
+    return record
+
+
+def apply(planner, changes, workers=1, convert_timeout=None):
+    """Carry out `changes`.
+
+    Returns (new sync state, {name: error message} for failures, {name: [warning, ...]}
+    for shortcuts written with a problem, such as Python's icon in place of their own).
+    """
+    backend = planner.backend
+    errors = {}
+    warnings = {}
+    failed_icons = {}
+    todo = [c for c in changes if c.action in (CREATE, UPDATE)]
+    if workers > 1 and todo and backend.uses_icon_cache:
+        failed_icons = warm_cache(planner.icon_cache, (c.entry["icon"] for c in todo), backend.icon_sizes,
+                                  workers, convert_timeout)
+
+    state = {}
+    for change in changes:
+        if change.action == DELETE:
+            try:
+                os.remove(change.shortcut_path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                errors[change.name] = str(e)
+                state[change.name] = planner.state[change.name]
+        elif change.action in (CREATE, UPDATE):
+            entry = change.entry
+            icon_error = failed_icons.get(entry["icon"])
+            try:
+                # An image the pool already failed on is not retried here, serially and without a timeout.
+                result = create_shortcut(entry["script"], "" if icon_error else entry["icon"], entry["name"],
+                                         entry["hide_console"], planner.desktop, backend, planner.icon_cache,
+                                         resolver=planner.resolver)
+                if icon_error:
+                    result.warnings.insert(0, f"Could not convert image: {icon_error}. Using Python's default icon.")
+                if result.warnings:
+                    warnings[change.name] = result.warnings
+                state[change.name] = _record(planner, change)
+            except ShortcutError as e:
+                errors[change.name] = str(e)
+        elif change.action == UNCHANGED:
+            state[change.name] = _record(planner, change)
+        elif change.action == ERROR:
+            errors[change.name] = "; ".join(change.reasons)
+    backend.finish()
+    planner.icon_cache.save()
+    planner.resolver.save()
+    return state, errors, warnings
+
+
+def print_plan(changes, verbose=False):
+    counts = {}
+    for change in changes:
+        counts[change.action] = counts.get(change.action, 0) + 1
+        if change.action != UNCHANGED or verbose:
+            reasons = f" ({', '.join(change.reasons)})" if change.reasons else ""
+            print(f"  {change.action:<9} {change.name}{reasons}")
+    print(f"{counts.get(CREATE, 0)} to create, {counts.get(UPDATE, 0)} to update, "
+          f"{counts.get(DELETE, 0)} to delete, {counts.get(UNCHANGED, 0)} unchanged, "
+          f"{counts.get(ERROR, 0)} with errors")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="main.py sync", description="Make the shortcuts on disk match a manifest.")
+    parser.add_argument("manifest", help="Path to a .toml, .json or .csv manifest")
+    parser.add_argument("--dry-run", action="store_true", help="Only print the plan")
+    parser.add_argument("--desktop", help="Folder the shortcuts live in "
+                                          "(default: your Desktop, or ~/.local/share/applications for .desktop files)")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default=DEFAULT_BACKEND,
+                        help="Launcher format and writer (default: %(default)s)")
+    parser.add_argument("--icon-cache", help="Icon cache folder (default: per-user cache)")
+    parser.add_argument("--workers", type=int, default=default_workers(),
+                        help="Processes used to convert icons; 1 converts serially (default: %(default)s)")
+    parser.add_argument("--convert-timeout", type=float,
+                        help="Give up on converting a single image after this many seconds")
+    parser.add_argument("--verbose", action="store_true", help="List unchanged shortcuts too")
+    args = parser.parse_args(argv)
+
+    try:
+        entries = load_manifest(args.manifest)
+    except ManifestError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    backend = get_backend(args.backend)
+    desktop = args.desktop or backend.default_dir()
+    path = state_path(desktop)
+    planner = Planner(desktop, IconCache(args.icon_cache), load_state(path), backend)
+    changes = planner.plan(entries)
+    print_plan(changes, args.verbose)
+    if args.dry_run:
+        return 0
+
+    state, errors, warnings = apply(planner, changes, args.workers, args.convert_timeout)
+    save_state(path, state)
+    for name, messages in warnings.items():
+        for message in messages:
+            print(f"  warning   {name}: {message}", file=sys.stderr)
+    for name, error in errors.items():
+        print(f"  failed    {name}: {error}", file=sys.stderr)
+    written = sum(1 for change in changes if change.action in (CREATE, UPDATE) and change.name not in errors)
+    print(f"Done: {written} written, {len(warnings)} with warnings, {len(errors)} failed.")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+import io
+import struct
+
+import pytest
+
+import ico
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def _png_bytes(image):
+    out = io.BytesIO()
+    image.save(out, format="PNG")
+    return out.getvalue()
+
+
+@pytest.fixture
+def logo():
+    """A 300 px disc on transparency: real alpha, so small frames may be BMP or PNG."""
+    image = Image.new("RGBA", (300, 300))
+    mask = Image.radial_gradient("L").resize((300, 300)).point(lambda v: 255 if v < 120 else 0)
+    image.paste(Image.linear_gradient("L").resize((300, 300)).convert("RGB"), (0, 0), mask)
+    return image
+
+
+def test_frame_table(logo):
+    data = ico.from_image(logo)
+    reserved, kind, count = struct.unpack_from("<HHH", data, 0)
+    assert (reserved, kind, count) == (0, 1, len(ico.DEFAULT_SIZES))
+
+    offset = 6 + 16 * count
+    for index, size in enumerate(ico.DEFAULT_SIZES):
+        width, height, colors, reserved, planes, bit_count, length, start = \
+            struct.unpack_from("<BBBBHHII", data, 6 + 16 * index)
+        assert (width, height) == (size % 256, size % 256)
+        assert (colors, reserved, planes, bit_count) == (0, 0, 1, 32)
+        assert start == offset
+        blob = data[start:start + length]
+        if blob.startswith(ico.PNG_SIGNATURE):
+            assert Image.open(io.BytesIO(blob)).size == (size, size)
+        else:
+            header_size, dib_width, dib_height, _, dib_bits = struct.unpack_from("<IiiHH", blob, 0)
+            assert (header_size, dib_width, dib_height, dib_bits) == (40, size, size * 2, 32)
+            # Header, BGRA pixels and a 1-bit mask with rows padded to 4 bytes.
+            assert length == 40 + size * size * 4 + ((size + 31) // 32) * 4 * size
+        offset += length
+    assert offset == len(data)
+
+
+def test_largest_frame_is_png(logo):
+    frames = ico.parse(ico.from_image(logo))
+    assert frames[-1].width == 256
+    assert frames[-1].data.startswith(ico.PNG_SIGNATURE)
+
+
+def test_parse_round_trips(logo):
+    data = ico.from_image(logo)
+    frames = ico.parse(data)
+    assert [(f.width, f.height) for f in frames] == [(s, s) for s in ico.DEFAULT_SIZES]
+    assert all(f.bit_count == 32 for f in frames)
+    assert ico.serialize(frames) == data
+
+
+def test_existing_frames_are_reused_byte_for_byte(logo):
+    existing = ico.from_image(logo, sizes=[16, 32, 256])
+    rebuilt = ico.parse(ico.build(existing))
+    assert [f.width for f in rebuilt] == ico.DEFAULT_SIZES
+
+    old = {f.width: f.data for f in ico.parse(existing)}
+    new = {f.width: f.data for f in rebuilt}
+    for size in (16, 32, 256):
+        assert new[size] == old[size]
+
+
+def test_all_sizes_present_skips_decoding(logo):
+    existing = ico.from_image(logo)
+    assert ico.build(existing) == existing
+
+
+def test_non_square_frames_keep_aspect_unless_padded():
+    image = Image.linear_gradient("L").resize((320, 180)).convert("RGB")
+    frames = ico.parse(ico.build(_png_bytes(image), sizes=[32, 256]))
+    assert [(f.width, f.height) for f in frames] == [(32, 18), (256, 144)]
+
+    padded = ico.parse(ico.build(_png_bytes(image), sizes=[32, 256], pad=True))
+    assert [(f.width, f.height) for f in padded] == [(32, 32), (256, 256)]
+
+
+def test_parse_rejects_bad_data():
+    with pytest.raises(ico.IcoParseError):
+        ico.parse(b"not an icon")
+    data = ico.from_image(Image.new("RGB", (64, 64), "red"), sizes=[16])
+    with pytest.raises(ico.IcoParseError):
+        ico.parse(data[:-10])
+
+
+def test_bmp_frame_layout():
+    image = Image.new("RGBA", (20, 20), (255, 0, 0, 255))
+    image.putpixel((0, 0), (0, 0, 0, 0))
+    frame = ico.Frame(20, 20, 32, ico._bmp_frame(image))
+    assert frame.format == "bmp"
+    # Header, BGRA pixels and a 1-bit mask with rows padded to 4 bytes.
+    assert len(frame.data) == 40 + 20 * 20 * 4 + 4 * 20
+    parsed, = ico.parse(ico.serialize([frame]))
+    assert (parsed.width, parsed.height, parsed.bit_count) == (20, 20, 32)
+
+    decoded = Image.open(io.BytesIO(ico.serialize([frame]))).convert("RGBA")
+    assert decoded.getpixel((0, 0))[3] == 0
+    assert decoded.getpixel((5, 5)) == (255, 0, 0, 255)
@@ -0,0 +1,98 @@
+import os
+
+import pytest
+
+from icon_cache import IconCache, icon_key
+
+SIZES = [(16, 16)]
+
+
+def fake_convert(src, dest, sizes):
+    # Stands in for the .ico encoder: a 1 KiB "icon" derived from the source bytes.
+    dest.write((src.read() * 1024)[:1024])
+
+
+@pytest.fixture
+def images(tmp_path):
+    paths = {}
+    for name in ("red", "green", "blue"):
+        path = tmp_path / f"{name}.png"
+        path.write_bytes(name.encode())
+        paths[name] = str(path)
+    return paths
+
+
+def shortcut(tmp_path, name):
+    path = tmp_path / f"{name}.lnk"
+    path.write_bytes(b"")
+    return str(path)
+
+
+def test_hit_reuses_one_file(tmp_path, images):
+    cache = IconCache(str(tmp_path / "cache"))
+    first = cache.get_or_create(images["red"], SIZES, fake_convert, ref=shortcut(tmp_path, "a"))
+    second = cache.get_or_create(images["red"], SIZES, fake_convert, ref=shortcut(tmp_path, "b"))
+    assert first == second
+    assert len(cache.entries) == 1
+
+
+def test_relative_root_and_refs_are_made_absolute(tmp_path, images, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cache = IconCache("cache")
+    shortcut(tmp_path, "a")
+    path = cache.get_or_create(images["red"], SIZES, fake_convert, ref="a.lnk")
+    assert os.path.isabs(cache.root) and os.path.isabs(path)
+    assert cache.entries[icon_key(b"red", SIZES)]["refs"] == [str(tmp_path / "a.lnk")]
+
+    monkeypatch.chdir(tmp_path / "cache")
+    assert cache.prune() == []
+
+
+def test_ref_moves_to_new_icon(tmp_path, images):
+    cache = IconCache(str(tmp_path / "cache"))
+    ref = shortcut(tmp_path, "s")
+    cache.get_or_create(images["red"], SIZES, fake_convert, ref=ref)
+    cache.get_or_create(images["blue"], SIZES, fake_convert, ref=ref)
+
+    red, blue = icon_key(b"red", SIZES), icon_key(b"blue", SIZES)
+    assert cache.entries[red]["refs"] == []
+    assert cache.entries[blue]["refs"] == [ref]
+    assert cache.prune() == [red]
+    assert not os.path.exists(cache.path_for(red))
+    assert os.path.exists(cache.path_for(blue))
+
+
+def test_prune_keeps_icons_of_existing_shortcuts(tmp_path, images):
+    cache = IconCache(str(tmp_path / "cache"))
+    kept = shortcut(tmp_path, "kept")
+    gone = shortcut(tmp_path, "gone")
+    cache.get_or_create(images["red"], SIZES, fake_convert, ref=kept)
+    cache.get_or_create(images["green"], SIZES, fake_convert, ref=gone)
+    os.remove(gone)
+
+    assert cache.prune() == [icon_key(b"green", SIZES)]
+    assert list(cache.entries) == [icon_key(b"red", SIZES)]
+
+
+def test_eviction_drops_least_recently_used_unreferenced(tmp_path, images):
+    cache = IconCache(str(tmp_path / "cache"), max_bytes=2048)
+    cache.get_or_create(images["red"], SIZES, fake_convert)
+    cache.get_or_create(images["green"], SIZES, fake_convert, ref=shortcut(tmp_path, "g"))
+    cache.entries[icon_key(b"green", SIZES)]["last_used"] = 0
+    cache.get_or_create(images["blue"], SIZES, fake_convert)
+
+    # Green is older but still referenced, so red goes instead.
+    assert sorted(cache.entries) == sorted([icon_key(b"green", SIZES), icon_key(b"blue", SIZES)])
+    assert cache.total_bytes() == 2048
+
+
+def test_index_survives_reload(tmp_path, images):
+    cache = IconCache(str(tmp_path / "cache"))
+    ref = shortcut(tmp_path, "a")
+    cache.get_or_create(images["red"], SIZES, fake_convert, ref=ref)
+    cache.save()
+
+    reloaded = IconCache(str(tmp_path / "cache"))
+    assert reloaded.entries == cache.entries
+    os.remove(reloaded.path_for(icon_key(b"red", SIZES)))
+    assert IconCache(str(tmp_path / "cache")).entries == {}
@@ -0,0 +1,63 @@
+import pytest
+
+import lnk
+
+CLSID = "0114020000000000c000000000000046"
+# FileAttributes (archive), three zero FILETIMEs, FileSize, IconIndex, ShowCommand, HotKey and reserved fields.
+HEADER_TAIL = "20000000" + "00" * 24 + "00000000" + "00000000" + "01000000" + "0000" + "0000" + "00000000" * 2
+VOLUME_ID = "11000000" "03000000" "00000000" "10000000" "00"
+
+
+def test_serialize_ansi_link_info():
+    link = lnk.ShellLink(target="C:\\a.exe", arguments="x", working_dir="C:\\", icon_location="i.ico",
+                         description="S")
+    expected = bytes.fromhex(
+        "4c000000" + CLSID
+        # IsUnicode | HasLinkInfo | HasName | HasWorkingDir | HasArguments | HasIconLocation
+        + "f6000000" + HEADER_TAIL
+        # LinkInfo: size 0x37, header 0x1C, VolumeIDAndLocalBasePath, then the four offsets.
+        + "37000000" "1c000000" "01000000" "1c000000" "2d000000" "00000000" "36000000"
+        + VOLUME_ID
+        + "433a5c612e65786500"  # C:\a.exe
+        + "00"  # CommonPathSuffix
+        # StringData, as counted UTF-16: name, working dir, arguments, icon location.
+        + "0100" "5300"
+        + "0300" "43003a005c00"
+        + "0100" "7800"
+        + "0500" "69002e00690063006f00"
+        + "00000000")  # terminal block
+    assert lnk.serialize(link) == expected
+
+
+def test_serialize_unicode_link_info():
+    link = lnk.ShellLink(target="C:\\\u4e2d.exe")
+    expected = bytes.fromhex(
+        "4c000000" + CLSID + "82000000" + HEADER_TAIL
+        # LinkInfo: size 0x53, header 0x24, then the four ANSI offsets and the two Unicode ones.
+        + "53000000" "24000000" "01000000" "24000000" "35000000" "00000000" "3e000000" "3f000000" "51000000"
+        + VOLUME_ID
+        + "433a5c3f2e65786500"  # C:\?.exe, the best cp1252 can do
+        + "00"
+        + "43003a005c002d4e2e00650078006500" "0000"  # C:\中.exe
+        + "0000"
+        + "00000000")
+    assert lnk.serialize(link) == expected
+
+
+@pytest.mark.parametrize("link", [
+    lnk.ShellLink(target="C:\\Python311\\pythonw.exe"),
+    lnk.ShellLink(target="C:\\Python311\\python.exe", arguments='"C:\\tools\\run me.py" --fast',
+                  working_dir="C:\\tools", icon_location="C:\\icons\\run.ico", icon_index=2,
+                  show_command=lnk.SW_SHOWMINNOACTIVE, description="Run me"),
+    lnk.ShellLink(target="D:\\\u30c4\u30fc\u30eb\\\u4e2d\u6587.exe", arguments="\u00e9t\u00e9",
+                  working_dir="D:\\\u30c4\u30fc\u30eb", description="\u4e2d\u6587"),
+])
+def test_parse_round_trips(link):
+    assert lnk.parse(lnk.serialize(link)) == link
+
+
+def test_parse_rejects_other_files():
+    with pytest.raises(lnk.LinkParseError):
+        lnk.parse(b"\0" * 100)
+    with pytest.raises(lnk.LinkParseError):
+        lnk.parse(lnk.serialize(lnk.ShellLink(target="C:\\a.exe", arguments="x" * 50))[:-60])
@@ -0,0 +1,106 @@
+"""Theme palettes and the stylesheet they are rendered into.
+
+Each theme is rendered to a finished stylesheet once and then reused, so
+switching back and forth never rebuilds the string. Transient states (drag hover,
+error status) are dynamic properties matched by the stylesheet, not new sheets.
+
+A JSON file in `themes/` named after a theme (e.g. `themes/dark.json`) overrides
+any of that theme's colors; `"base"` picks which built-in palette it starts from.
+"""
+import json
+import os
+from collections import namedtuple
+from functools import lru_cache
+
+THEME_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "themes")
+
+STYLESHEET_TEMPLATE = """
+    QMainWindow {{ background-color: {bg_main}; }}
+    QWidget {{ color: {text_primary}; font-family: 'Segoe UI', system-ui, sans-serif; font-size: 10pt; }}
+    #header {{ background-color: {bg_secondary}; border-bottom: 1px solid {border}; }}
+    #title {{ font-size: 14pt; font-weight: 500; }}
+    QPushButton#themeButton {{ background-color: {bg_input}; border: 1px solid {border}; border-radius: 8px; font-size: 16pt; padding: 0; }}
+    QPushButton#themeButton:hover {{ background-color: {btn_gray_hover}; }}
+    #sectionLabel {{ font-size: 11pt; font-weight: 600; margin-bottom: 4px; }}
+    #fileDropWidget {{ background-color: {bg_input}; border: 1px solid {border}; border-radius: 8px; }}
+    #fileDropWidget[dragOver="true"] {{ border: 1px solid {accent}; }}
+    #fileDropWidget QLineEdit {{ background-color: transparent; border: none; padding-left: 10px; }}
+    QLineEdit {{ background-color: {bg_input}; border: 1px solid {border}; border-radius: 6px; padding: 0 15px; }}
+    QLineEdit:focus {{ border: 1px solid {accent}; }}
+    QPushButton {{ background-color: {bg_input}; border: 1px solid {border}; border-radius: 6px; font-weight: 500; }}
+    QPushButton#browseButton {{ background-color: {btn_gray}; }}
+    QPushButton#browseButton:hover {{ background-color: {btn_gray_hover}; }}
+    QPushButton#clearButton {{ background-color: {red}; border-color: {red}; color: {clear_text}; }}
+    QPushButton#clearButton:hover {{ background-color: {red_hover}; border-color: {red_hover}; }}
+    QPushButton#cancelButton, QPushButton#detailsButton {{ background-color: {btn_gray}; font-size: 11pt; border-radius: 8px; }}
+    QPushButton#cancelButton:hover, QPushButton#detailsButton:hover {{ background-color: {btn_gray_hover}; }}
+    QPushButton#createButton {{ background-color: {accent}; border: none; color: #ffffff; font-size: 11pt; font-weight: 600; border-radius: 8px; }}
+    QPushButton#createButton:hover {{ background-color: {accent_hover}; }}
+    #previewLabel {{ color: {text_secondary}; font-weight: 600; margin-bottom: 5px; }}
+    #preview {{ background-color: {preview_bg}; border: 1px solid {border}; border-radius: 8px; color: {text_secondary}; font-size: 9pt; }}
+    QCheckBox {{ spacing: 10px; }}
+    QCheckBox::indicator {{ width: 20px; height: 20px; border-radius: 4px; border: 2px solid {border}; background-color: {bg_input}; }}
+    QCheckBox::indicator:hover {{ border-color: {accent}; }}
+    QCheckBox::indicator:checked {{ background-color: {accent}; border-color: {accent}; image: url(data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iMTYiIGhlaWdodD0iMTYiIHZpZXdCb3g9IjAgMCAxNiAxNiIgZmlsbD0ibm9uZSIgeG1sbnM9Imh0dHA6Ly93d3cudzMub3JnLzIwMDAvc3ZnIj4KPHBhdGggZD0iTTEzLjMzMzMgNEw2IDExLjMzMzNMMi42NjY2NyA4IiBzdHJva2U9IndoaXRlIiBzdHJva2Utd2lkdGg9IjIiIHN0cm9rZS1saW5lY2FwPSJyb3VuZCIgc3Ryb2tlLWxpbmVqb2luPSJyb3VuZCIvPgo8L3N2Zz4K); }}
+    #statusBar {{ background-color: {bg_secondary}; border-top: 1px solid {border}; color: {text_secondary}; font-size: 9pt; }}
+    #statusBar[error="true"] {{ color: {error}; }}
+"""
+
+PALETTES = {
+    "dark": {
+        "bg_main": "#1a1a1a",
+        "bg_secondary": "#252525",
+        "bg_input": "#2a2a2a",
+        "text_primary": "#e8e8e8",
+        "text_secondary": "#a0a0a0",
+        "border": "#3a3a3a",
+        "accent": "#4a9eff",
+        "accent_hover": "#3a8eef",
+        "btn_gray": "#3f3f3f",
+        "btn_gray_hover": "#4a4a4a",
+        "red": "#c94040",
+        "red_hover": "#b33030",
+        "clear_text": "white",
+        "preview_bg": "#2a2a2a",
+        "error": "#ff6b6b",
+    },
+    "light": {
+        "bg_main": "#ffffff",
+        "bg_secondary": "#f5f5f5",
+        "bg_input": "#ffffff",
+        "text_primary": "#1a1a1a",
+        "text_secondary": "#666666",
+        "border": "#e0e0e0",
+        "accent": "#2563eb",
+        "accent_hover": "#1d4ed8",
+        "btn_gray": "#f0f0f0",
+        "btn_gray_hover": "#e2e8f0",
+        "red": "#e53e3e",
+        "red_hover": "#c53030",
+        "clear_text": "black",
+        "preview_bg": "#f5f5f5",
+        "error": "#d32f2f",
+    },
+}
+
+
+# A namedtuple rather than a dataclass: this module is on the startup path and
+# dataclasses pulls in inspect and re.
+Theme = namedtuple("Theme", "name colors stylesheet")
+
+
+def _load_palette(name, theme_dir):
+    path = os.path.join(theme_dir, f"{name}.json")
+    if not os.path.exists(path):
+        return dict(PALETTES.get(name, PALETTES["dark"]))
+    with open(path, encoding="utf-8") as f:
+        overrides = json.load(f)
+    palette = dict(PALETTES.get(overrides.pop("base", name), PALETTES["dark"]))
+    palette.update(overrides)
+    return palette
+
+
+@lru_cache(maxsize=None)
+def get_theme(name, theme_dir=THEME_DIR):
+    colors = _load_palette(name, theme_dir)
+    return Theme(name, colors, STYLESHEET_TEMPLATE.format(**colors))
@@ -0,0 +1,161 @@
+"""Timing spans for the steps of creating a shortcut.
+
+A Trace collects one span per step (validation, icon conversion, link write,
+explorer launch), each with its duration, input sizes and outcome. Finished
+traces are appended to a rotating JSON-lines log, one line per span:
+
+    {"trace": "3f2a...", "op": "create_shortcut", "span": "icon", "start": 1718000000.12,
+     "duration_ms": 41.7, "outcome": "ok", "image_bytes": 48213}
+
+Logging is off unless PINNER_TRACE is set (to 1 for the default log file, or to a
+path). When it is off, `start` hands back NULL_TRACE, whose spans do nothing, so
+instrumented code pays one attribute lookup per step.
+"""
+import os
+import threading
+import time
+import uuid
+
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUPS = 3
+
+_logger = None
+_logger_lock = threading.Lock()
+
+
+def default_log_path():
+    from icon_cache import app_cache_dir
+    return os.path.join(app_cache_dir(), "logs", "trace.jsonl")
+
+
+def log_path():
+    """Where traces are logged, or None when tracing is off."""
+    value = os.environ.get("PINNER_TRACE", "")
+    if value.lower() in ("", "0", "false", "no", "off"):
+        return None
+    return default_log_path() if value.lower() in ("1", "true", "yes", "on") else value
+
+
+def _get_logger():
+    global _logger
+    with _logger_lock:
+        if _logger is None:
+            import logging
+            from logging.handlers import RotatingFileHandler
+            path = log_path() or default_log_path()
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            handler = RotatingFileHandler(path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            _logger = logging.getLogger("taskbar_pinner.trace")
+            _logger.propagate = False
+            _logger.setLevel(logging.INFO)
+            _logger.addHandler(handler)
+        return _logger
+
+
+class Span:
+    """One timed step. Use as a context manager; add attributes with `set`."""
+    def __init__(self, name, attrs):
+        self.name = name
+        self.attrs = attrs
+        self.start = 0.0
+        self.duration_ms = 0.0
+        self.outcome = "ok"
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        self.start = time.time()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration_ms = (time.perf_counter() - self._started) * 1000
+        if exc_type is not None:
+            self.outcome = "error"
+            self.attrs["error"] = f"{exc_type.__name__}: {exc}"
+        return False
+
+    def record(self):
+        return {"span": self.name, "start": round(self.start, 6), "duration_ms": round(self.duration_ms, 3),
+                "outcome": self.outcome, **self.attrs}
+
+
+class Trace:
+    """The spans of one operation. `finish` logs them, if `log` is set."""
+    enabled = True
+
+    def __init__(self, op, log=True, **attrs):
+        self.op = op
+        self.log = log
+        self.id = uuid.uuid4().hex
+        self.attrs = attrs
+        self.spans = []
+        self.started = time.perf_counter()
+        self.duration_ms = None
+        self.outcome = None
+
+    def span(self, name, **attrs):
+        span = Span(name, attrs)
+        self.spans.append(span)
+        return span
+
+    def finish(self, outcome="ok"):
+        if self.outcome is not None:
+            return
+        self.outcome = outcome
+        self.duration_ms = (time.perf_counter() - self.started) * 1000
+        if self.log:
+            import json
+            logger = _get_logger()
+            head = {"trace": self.id, "op": self.op}
+            # One call per trace, so its lines stay together and the handler lock is taken once.
+            logger.info("\n".join(json.dumps({**head, **record}, default=str) for record in self.records()))
+
+    def records(self):
+        """Every span as a dict, followed by one for the whole operation."""
+        total = {"span": self.op, "start": round(self.spans[0].start if self.spans else time.time(), 6),
+                 "duration_ms": round(self.duration_ms or 0.0, 3), "outcome": self.outcome or "running",
+                 **self.attrs}
+        return [span.record() for span in self.spans] + [total]
+
+
+class _NullSpan:
+    def set(self, **attrs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+class _NullTrace:
+    enabled = False
+    _span = _NullSpan()
+
+    def span(self, name, **attrs):
+        return self._span
+
+    def finish(self, outcome="ok"):
+        pass
+
+    def records(self):
+        return []
+
+
+NULL_TRACE = _NullTrace()
+
+
+def start(op, **attrs):
+    """A logged Trace when PINNER_TRACE is set, otherwise NULL_TRACE."""
+    return Trace(op, **attrs) if log_path() else NULL_TRACE
+
+
+def file_size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return None